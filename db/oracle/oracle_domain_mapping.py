@@ -5,150 +5,157 @@ Maps business/domain terminology to actual Oracle CIMS database table names
 """
 
 import re
+from types import MappingProxyType
+
+# Domain term -> Oracle table name
+_TABLE_MAPPINGS = MappingProxyType({
+    # Signal/Sensor Mappings
+    "signal": "SIGNALITEM",
+    "signals": "SIGNALITEM", 
+    "sensor": "SIGNALITEM",
+    "sensors": "SIGNALITEM",
+    "signal_definitions": "SIGNALITEM",
+    "sensor_definitions": "SIGNALITEM",
+    "measurement_points": "SIGNALITEM",
+    "data_points": "SIGNALITEM",
+    "instruments": "SIGNALITEM",
+
+    # Current Signal Values
+    "current_values": "SIGNALVALUE",
+    "live_data": "SIGNALVALUE",
+    "real_time_data": "SIGNALVALUE",
+    "current_readings": "SIGNALVALUE",
+    "latest_values": "SIGNALVALUE",
+    "signal_values": "SIGNALVALUE",
+
+    # Historical Data
+    "historical_data": "REPDATA",
+    "history": "REPDATA",
+    "historical_values": "REPDATA",
+    "time_series": "REPDATA",
+    "archived_data": "REPDATA",
+    "process_data": "REPDATA",
+    "measurements": "REPDATA",
+    "readings": "REPDATA",
+
+    # Report Items (Calculations/Aggregations)
+    "calculations": "REPITEM",
+    "calculated_values": "REPITEM",
+    "aggregations": "REPITEM",
+    "aggregated_data": "REPITEM",
+    "computed_data": "REPITEM",
+    "analytics": "REPITEM",
+    "reports": "REPITEM",
+    "report_items": "REPITEM",
+    "kpi": "REPITEM",
+    "metrics": "REPITEM",
+
+    # Communication Channels
+    "channels": "SIGNALCHANNEL",
+    "signal_channels": "SIGNALCHANNEL",
+    "communication_channels": "SIGNALCHANNEL",
+    "data_sources": "SIGNALCHANNEL",
+    "connections": "SIGNALCHANNEL",
+    "interfaces": "SIGNALCHANNEL",
+    "protocols": "SIGNALCHANNEL",
+
+    # Channel Groups
+    "groups": "CHANNELGROUP",
+    "channel_groups": "CHANNELGROUP",
+    "signal_groups": "CHANNELGROUP",
+    "equipment_groups": "CHANNELGROUP",
+    "areas": "CHANNELGROUP",
+    "zones": "CHANNELGROUP",
+
+    # Process Time Periods
+    "time_periods": "PROCINSTANCE",
+    "process_instances": "PROCINSTANCE",
+    "periods": "PROCINSTANCE",
+    "intervals": "PROCINSTANCE",
+    "batches": "PROCINSTANCE",
+    "runs": "PROCINSTANCE",
+    "sessions": "PROCINSTANCE",
+
+    # External Systems/Addresses
+    "addresses": "ADDRESS",
+    "external_systems": "ADDRESS",
+    "remote_systems": "ADDRESS",
+    "customers": "ADDRESS",
+    "endpoints": "ADDRESS",
+    "destinations": "ADDRESS"
+})
+
+# Business terminology mapping
+_BUSINESS_TERMS = MappingProxyType({
+    # Process Industry Terms
+    "temperature": ["temp", "thermal", "heat", "degrees"],
+    "pressure": ["press", "force", "psi", "bar", "pascal"],
+    "flow": ["flowrate", "rate", "volume", "throughput"],
+    "level": ["height", "depth", "tank_level", "fill"],
+    "vibration": ["vibe", "oscillation", "shake", "frequency"],
+    "power": ["electrical", "energy", "watts", "consumption"],
+    "humidity": ["moisture", "water_content", "rh"],
+
+    # Equipment Terms
+    "pump": ["motor", "compressor", "fan"],
+    "tank": ["vessel", "container", "storage"],
+    "valve": ["actuator", "damper", "control"],
+    "line": ["pipe", "conduit", "duct"],
+
+    # Process Terms
+    "production": ["manufacturing", "output", "yield"],
+    "quality": ["specification", "grade", "standard"],
+    "efficiency": ["performance", "utilization", "productivity"],
+    "alarm": ["alert", "warning", "fault", "error"],
+
+    # Time-based Terms
+    "hourly": ["hour", "hr", "h"],
+    "daily": ["day", "d", "24h"],
+    "weekly": ["week", "7d"],
+    "monthly": ["month", "30d"],
+    "shift": ["period", "block", "rotation"],
+
+    # Status Terms
+    "online": ["active", "running", "operational"],
+    "offline": ["inactive", "stopped", "down"],
+    "fault": ["error", "alarm", "problem", "issue"],
+    "normal": ["ok", "good", "stable", "healthy"],
+
+    # Aggregation Terms
+    "average": ["avg", "mean"],
+    "maximum": ["max", "peak", "highest"],
+    "minimum": ["min", "lowest"],
+    "total": ["sum", "cumulative"],
+    "count": ["number", "quantity", "amount"]
+})
+
+# Operator mappings
+_OPERATORS = MappingProxyType({
+    "greater than": ">",
+    "less than": "<", 
+    "equals": "=",
+    "not equals": "!=",
+    "above": ">",
+    "below": "<",
+    "over": ">",
+    "under": "<",
+    "higher": ">",
+    "lower": "<",
+    "exceeds": ">",
+    "beyond": ">",
+    "within": "BETWEEN",
+    "between": "BETWEEN",
+    "like": "LIKE",
+    "contains": "LIKE",
+    "includes": "LIKE"
+})
 
 class OracleDomainMapper:
     def __init__(self):
-        self.table_mappings = {
-            # Signal/Sensor Mappings
-            "signal": "SIGNALITEM",
-            "signals": "SIGNALITEM", 
-            "sensor": "SIGNALITEM",
-            "sensors": "SIGNALITEM",
-            "signal_definitions": "SIGNALITEM",
-            "sensor_definitions": "SIGNALITEM",
-            "measurement_points": "SIGNALITEM",
-            "data_points": "SIGNALITEM",
-            "instruments": "SIGNALITEM",
-            
-            # Current Signal Values
-            "current_values": "SIGNALVALUE",
-            "live_data": "SIGNALVALUE",
-            "real_time_data": "SIGNALVALUE",
-            "current_readings": "SIGNALVALUE",
-            "latest_values": "SIGNALVALUE",
-            "signal_values": "SIGNALVALUE",
-            
-            # Historical Data
-            "historical_data": "REPDATA",
-            "history": "REPDATA",
-            "historical_values": "REPDATA",
-            "time_series": "REPDATA",
-            "archived_data": "REPDATA",
-            "process_data": "REPDATA",
-            "measurements": "REPDATA",
-            "readings": "REPDATA",
-            
-            # Report Items (Calculations/Aggregations)
-            "calculations": "REPITEM",
-            "calculated_values": "REPITEM",
-            "aggregations": "REPITEM",
-            "aggregated_data": "REPITEM",
-            "computed_data": "REPITEM",
-            "analytics": "REPITEM",
-            "reports": "REPITEM",
-            "report_items": "REPITEM",
-            "kpi": "REPITEM",
-            "metrics": "REPITEM",
-            
-            # Communication Channels
-            "channels": "SIGNALCHANNEL",
-            "signal_channels": "SIGNALCHANNEL",
-            "communication_channels": "SIGNALCHANNEL",
-            "data_sources": "SIGNALCHANNEL",
-            "connections": "SIGNALCHANNEL",
-            "interfaces": "SIGNALCHANNEL",
-            "protocols": "SIGNALCHANNEL",
-            
-            # Channel Groups
-            "groups": "CHANNELGROUP",
-            "channel_groups": "CHANNELGROUP",
-            "signal_groups": "CHANNELGROUP",
-            "equipment_groups": "CHANNELGROUP",
-            "areas": "CHANNELGROUP",
-            "zones": "CHANNELGROUP",
-            
-            # Process Time Periods
-            "time_periods": "PROCINSTANCE",
-            "process_instances": "PROCINSTANCE",
-            "periods": "PROCINSTANCE",
-            "intervals": "PROCINSTANCE",
-            "batches": "PROCINSTANCE",
-            "runs": "PROCINSTANCE",
-            "sessions": "PROCINSTANCE",
-            
-            # External Systems/Addresses
-            "addresses": "ADDRESS",
-            "external_systems": "ADDRESS",
-            "remote_systems": "ADDRESS",
-            "customers": "ADDRESS",
-            "endpoints": "ADDRESS",
-            "destinations": "ADDRESS"
-        }
-        
-        # Business terminology mapping
-        self.business_terms = {
-            # Process Industry Terms
-            "temperature": ["temp", "thermal", "heat", "degrees"],
-            "pressure": ["press", "force", "psi", "bar", "pascal"],
-            "flow": ["flowrate", "rate", "volume", "throughput"],
-            "level": ["height", "depth", "tank_level", "fill"],
-            "vibration": ["vibe", "oscillation", "shake", "frequency"],
-            "power": ["electrical", "energy", "watts", "consumption"],
-            "humidity": ["moisture", "water_content", "rh"],
-            
-            # Equipment Terms
-            "pump": ["motor", "compressor", "fan"],
-            "tank": ["vessel", "container", "storage"],
-            "valve": ["actuator", "damper", "control"],
-            "line": ["pipe", "conduit", "duct"],
-            
-            # Process Terms
-            "production": ["manufacturing", "output", "yield"],
-            "quality": ["specification", "grade", "standard"],
-            "efficiency": ["performance", "utilization", "productivity"],
-            "alarm": ["alert", "warning", "fault", "error"],
-            
-            # Time-based Terms
-            "hourly": ["hour", "hr", "h"],
-            "daily": ["day", "d", "24h"],
-            "weekly": ["week", "7d"],
-            "monthly": ["month", "30d"],
-            "shift": ["period", "block", "rotation"],
-            
-            # Status Terms
-            "online": ["active", "running", "operational"],
-            "offline": ["inactive", "stopped", "down"],
-            "fault": ["error", "alarm", "problem", "issue"],
-            "normal": ["ok", "good", "stable", "healthy"],
-            
-            # Aggregation Terms
-            "average": ["avg", "mean"],
-            "maximum": ["max", "peak", "highest"],
-            "minimum": ["min", "lowest"],
-            "total": ["sum", "cumulative"],
-            "count": ["number", "quantity", "amount"]
-        }
-        
-        # Operator mappings
-        self.operators = {
-            "greater than": ">",
-            "less than": "<", 
-            "equals": "=",
-            "not equals": "!=",
-            "above": ">",
-            "below": "<",
-            "over": ">",
-            "under": "<",
-            "higher": ">",
-            "lower": "<",
-            "exceeds": ">",
-            "beyond": ">",
-            "within": "BETWEEN",
-            "between": "BETWEEN",
-            "like": "LIKE",
-            "contains": "LIKE",
-            "includes": "LIKE"
-        }
+        # Shared read-only tables; nothing is rebuilt per instance
+        self.table_mappings = _TABLE_MAPPINGS
+        self.business_terms = _BUSINESS_TERMS
+        self.operators = _OPERATORS
 
     def get_table_for_domain(self, domain_term: str) -> str:
         """Get the actual table name for a business domain term"""
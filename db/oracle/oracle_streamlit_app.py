@@ -6,10 +6,7 @@ Interactive web interface with visualizations and real-time query processing
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import json
+from datetime import datetime
 import time
 from oracle_query_interface import OracleQueryInterface
 from oracle_domain_mapping import OracleDomainMapper
@@ -126,6 +123,12 @@ def get_sample_data():
     
     return pd.DataFrame(data, columns=columns)
 
+def select_sample_query():
+    """Copy the selected sample query into the query input"""
+    choice = st.session_state.get('sample_query_choice')
+    if choice:
+        st.session_state.sample_query = choice
+
 def main():
     """Main Streamlit application"""
     
@@ -179,9 +182,14 @@ def main():
             "Show signals with good quality data"
         ]
         
-        for i, query in enumerate(sample_queries):
-            if st.button(f"📝 {query}", key=f"sample_{i}", width='stretch'):
-                st.session_state.sample_query = query
+        st.radio(
+            "Sample queries",
+            sample_queries,
+            index=None,
+            key="sample_query_choice",
+            on_change=select_sample_query,
+            label_visibility="collapsed"
+        )
         
         st.divider()
         
@@ -255,6 +263,8 @@ def main():
             sample_data = get_sample_data()
         
         if not sample_data.empty:
+            import plotly.express as px
+            
             # Convert timestamp to datetime
             sample_data['UPDATETIME'] = pd.to_datetime(sample_data['UPDATETIME'])
             
@@ -344,6 +354,8 @@ def main():
                     
                     # Generate visualization
                     try:
+                        import plotly.express as px
+                        
                         if viz_type == "Line Chart" and 'UPDATETIME' in df.columns:
                             df_viz = df.copy()
                             df_viz['UPDATETIME'] = pd.to_datetime(df_viz['UPDATETIME'])
@@ -11,11 +11,28 @@ from typing import List
 def populate_oracle_iot_db():
     """Populate the Oracle-based IoT database with sample data"""
     
-    conn = sqlite3.connect('oracle_iot_db.db')
+    conn = sqlite3.connect('oracle_iot_db.db', cached_statements=256)
     cursor = conn.cursor()
     
+    # Single timestamp shared by every row written in this run
+    now = datetime.datetime.now()
+    
     print("Populating Oracle-based IoT database...")
     
+    # One explicit transaction covers the index drop, the load and the rebuild; without
+    # it the DROP INDEX statements would autocommit and outlive a failed load
+    cursor.execute("BEGIN")
+    
+    # Drop secondary indexes on the bulk-loaded tables; they are rebuilt
+    # in one pass once all rows are in place
+    cursor.execute("""
+        SELECT name, sql FROM sqlite_master 
+        WHERE type = 'index' AND tbl_name IN ('REPDATA', 'SIGNALITEM', 'SIGNALVALUE') AND sql IS NOT NULL
+    """)
+    saved_indexes = cursor.fetchall()
+    for index_name, _ in saved_indexes:
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+    
     # 1. Create Channel Groups
     channel_groups = [
         (1, 'Production_Line_A', 'ProdLineA', 1, 'Main production line sensors', 0, 0, 1000),
@@ -25,12 +42,11 @@ def populate_oracle_iot_db():
         (5, 'Power_Monitoring', 'PowerMon', 5, 'Electrical systems monitoring', 0, 1, 100)
     ]
     
-    for group in channel_groups:
-        cursor.execute("""
-            INSERT OR REPLACE INTO CHANNELGROUP 
-            (GROUPNR, GROUPNAME, ALIASNAME, NODENR, DESCRIPTION, BUFFERED, FASTDATAAC, FDATIMESLOT, DEFDATE, ATCREATOR)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (*group, datetime.datetime.now(), 'system'))
+    cursor.executemany("""
+        INSERT OR REPLACE INTO CHANNELGROUP 
+        (GROUPNR, GROUPNAME, ALIASNAME, NODENR, DESCRIPTION, BUFFERED, FASTDATAAC, FDATIMESLOT, DEFDATE, ATCREATOR)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(*group, now, 'system') for group in channel_groups])
     
     print("Created channel groups")
     
@@ -43,12 +59,11 @@ def populate_oracle_iot_db():
         (105, 'TCP_MODBUS_01', 'TCPModbus1', 5, 0, 'D', 'TCP Modbus Gateway', 5, 'modbus-gateway', 'TCPMB_PROG', 'TCPMB_HDA', 1)
     ]
     
-    for channel in channels:
-        cursor.execute("""
-            INSERT OR REPLACE INTO SIGNALCHANNEL 
-            (CHANNR, CHANNAME, ALIASNAME, SIGPROTID, SLAVE, DEFLOGCLASS, CHANDESCR, GROUPNR, HOSTNAME, PROGID, HDAPROGID, EXTSYNCHRO, DEFDATE, ATCREATOR)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (*channel, datetime.datetime.now(), 'admin'))
+    cursor.executemany("""
+        INSERT OR REPLACE INTO SIGNALCHANNEL 
+        (CHANNR, CHANNAME, ALIASNAME, SIGPROTID, SLAVE, DEFLOGCLASS, CHANDESCR, GROUPNR, HOSTNAME, PROGID, HDAPROGID, EXTSYNCHRO, DEFDATE, ATCREATOR)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(*channel, now, 'admin') for channel in channels])
     
     print("Created signal channels")
     
@@ -82,9 +97,9 @@ def populate_oracle_iot_db():
                 '°C' if sig_type[2] == 'Temperature' else 'bar' if sig_type[2] == 'Pressure' else 'L/min' if sig_type[2] == 'Flow' else '%',
                 1.0,
                 0,
-                datetime.datetime.now(),
+                now,
                 'system',
-                datetime.datetime.now(),
+                now,
                 'admin',
                 0.0 if sig_type[1] == 'DIGITAL' else -100.0,
                 1.0 if sig_type[1] == 'DIGITAL' else 1000.0
@@ -101,7 +116,7 @@ def populate_oracle_iot_db():
     print(f"Created {len(signals)} signal items")
     
     # 4. Create Process Instances (time periods)
-    start_date = datetime.datetime.now() - datetime.timedelta(days=30)
+    start_date = now - datetime.timedelta(days=30)
     process_instances = []
     pinstid = 1
     
@@ -155,45 +170,31 @@ def populate_oracle_iot_db():
                 2,  # Decimals
                 1.0,  # Scale
                 f'PLC_{group}',  # PLC code
-                None, None, None, None,  # Additional PLC codes
                 1000 + group,  # VSIGID1
-                None, None, None, None, None, None, None, None, None,  # Other signal IDs
-                None, None, None,  # CSIGID
-                None,  # SORTRICODE
-                None, None, None, None, None, None, None,  # AUXNUMVAL
-                None, None,  # AUXDATEVAL
-                None, None,  # CUM fields
-                None, None, None, None,  # Other fields
                 0.1,  # DEADBAND
                 0,  # STOPLOG
                 f'Calculated {calc[1]} for equipment group {group}',
                 f'CALC_{ricode}',  # EXTGUID
-                datetime.datetime.now(),
+                now,
                 'system',
-                datetime.datetime.now(),
+                now,
                 'admin',
-                0, None, 1  # LIMITLOG, LIMITPTYPE, LIMITLEVEL
+                0, 1  # LIMITLOG, LIMITLEVEL
             ))
             ricode += 1
     
     cursor.executemany("""
         INSERT OR REPLACE INTO REPITEM 
         (RICODE, RICLASS, LOGCLASS, RITEXT, ALIASNAME, RIUNIT, RIDECIMALS, RISCALE, PLCRICODE,
-         PLCRICODE2, PLCRICODE3, PLCRICODE4, PLCRICODE5, VSIGID1, VSIGID2, VSIGID3, VSIGID4, VSIGID5,
-         VSIGID6, VSIGID7, VSIGID8, VSIGID9, VSIGID10, CSIGID1, CSIGID2, CSIGID3, SORTRICODE,
-         AUXNUMVAL1, AUXNUMVAL2, AUXNUMVAL3, AUXNUMVAL4, AUXNUMVAL5, AUXNUMVAL6, AUXNUMVAL7,
-         AUXDATEVAL1, AUXDATEVAL2, CUMPTYPE, CUMRICODE, OSIGID1, LIMITID, LOCID, MSIGID,
-         DEADBAND, STOPLOG, DESCRIPTION, EXTGUID, DEFDATE, ATMODIFIER, ATCREDATE, ATCREATOR,
-         LIMITLOG, LIMITPTYPE, LIMITLEVEL)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+         VSIGID1, DEADBAND, STOPLOG, DESCRIPTION, EXTGUID, DEFDATE, ATMODIFIER, ATCREDATE, ATCREATOR,
+         LIMITLOG, LIMITLEVEL)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, report_items)
     
     print(f"Created {len(report_items)} report items")
     
     # 6. Generate Signal Values (current values)
     signal_values = []
-    now = datetime.datetime.now()
     
     for sigid in range(1000, 1100):  # Sample of signals
         if random.random() > 0.1:  # 90% of signals have current values
@@ -253,6 +254,12 @@ def populate_oracle_iot_db():
     
     print(f"Created {len(rep_data)} historical data records")
     
+    # Rebuild the indexes dropped before the bulk load
+    for _, index_sql in saved_indexes:
+        cursor.execute(index_sql)
+    
+    print(f"Rebuilt {len(saved_indexes)} indexes")
+    
     conn.commit()
     conn.close()
     
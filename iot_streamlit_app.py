@@ -119,6 +119,12 @@ def get_sample_data():
     
     return pd.DataFrame(data, columns=columns)
 
+def select_sample_query():
+    """Copy the selected sample query into the query input"""
+    choice = st.session_state.get('sample_query_choice')
+    if choice:
+        st.session_state.sample_query = choice
+
 def main():
     """Main Streamlit application"""
     
@@ -168,9 +174,14 @@ def main():
             "List all devices in Factory Floor A"
         ]
         
-        for i, query in enumerate(sample_queries):
-            if st.button(f"📝 {query}", key=f"sample_{i}", width='stretch'):
-                st.session_state.sample_query = query
+        st.radio(
+            "Sample queries",
+            sample_queries,
+            index=None,
+            key="sample_query_choice",
+            on_change=select_sample_query,
+            label_visibility="collapsed"
+        )
         
         st.divider()
         
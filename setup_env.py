@@ -7,27 +7,45 @@ Helps configure development and production environments
 import os
 import shutil
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-def setup_development():
-    """Setup development environment"""
-    print("Setting up DEVELOPMENT environment...")
-    
-    # Copy development env file
-    if Path('.env.development').exists():
-        shutil.copy('.env.development', '.env')
-        print("✅ Copied .env.development to .env")
-    elif Path('.env.development.template').exists():
-        shutil.copy('.env.development.template', '.env.development')
-        shutil.copy('.env.development.template', '.env')
-        print("✅ Created .env.development from template and copied to .env")
-        print("⚠️  Please update .env.development with your actual API key")
+try:
+    from dotenv import dotenv_values
+except ImportError:
+    dotenv_values = None  # dotenv not installed, use the minimal parser below
+
+# Settings whose values are never echoed by check_environment
+_HIDDEN_KEYS = ('PASSWORD', 'API_KEY')
+
+def _setup_env(name: str) -> bool:
+    """Copy .env.<name> to .env and select the environment; returns False if missing"""
+    print(f"Setting up {name.upper()} environment...")
+    
+    env_file = f'.env.{name}'
+    template_file = f'{env_file}.template'
+    
+    # Copy environment file (falling back to its template if one exists)
+    if Path(env_file).exists():
+        shutil.copyfile(env_file, '.env')
+        print(f"✅ Copied {env_file} to .env")
+    elif Path(template_file).exists():
+        shutil.copyfile(template_file, env_file)
+        shutil.copyfile(template_file, '.env')
+        print(f"✅ Created {env_file} from template and copied to .env")
+        print(f"⚠️  Please update {env_file} with your actual API key")
     else:
-        print("❌ .env.development file not found")
+        print(f"❌ {env_file} file not found")
         return False
     
     # Set environment variable
-    os.environ['IOT_ENV'] = 'development'
+    os.environ['IOT_ENV'] = name
+    return True
+
+def setup_development():
+    """Setup development environment"""
+    if not _setup_env('development'):
+        return False
     
     # Check if database needs setup
     if not Path('iot_production.db').exists():
@@ -53,19 +71,9 @@ def setup_development():
 
 def setup_production():
     """Setup production environment"""
-    print("Setting up PRODUCTION environment...")
-    
-    # Copy production env file
-    if Path('.env.production').exists():
-        shutil.copy('.env.production', '.env')
-        print("✅ Copied .env.production to .env")
-    else:
-        print("❌ .env.production file not found")
+    if not _setup_env('production'):
         return False
     
-    # Set environment variable
-    os.environ['IOT_ENV'] = 'production'
-    
     print("⚠️  IMPORTANT: Update .env with your Oracle database credentials:")
     print("  - ORACLE_PROD_HOST")
     print("  - ORACLE_PROD_SERVICE") 
@@ -81,23 +89,28 @@ def setup_production():
 
 def setup_staging():
     """Setup staging environment"""
-    print("Setting up STAGING environment...")
-    
-    # Copy staging env file
-    if Path('.env.staging').exists():
-        shutil.copy('.env.staging', '.env')
-        print("✅ Copied .env.staging to .env")
-    else:
-        print("❌ .env.staging file not found")
+    if not _setup_env('staging'):
         return False
     
-    # Set environment variable
-    os.environ['IOT_ENV'] = 'staging'
-    
     print("📝 Edit .env to configure staging database (SQLite or Oracle)")
     print("🎉 Staging environment configured!")
     return True
 
+@lru_cache(maxsize=1)
+def _read_env_file(mtime: float) -> dict:
+    """Parse .env into a dict; cached until the file's modification time changes"""
+    if dotenv_values is not None:
+        return dict(dotenv_values('.env'))
+    
+    env = {}
+    with open('.env', 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                key, _, value = line.partition('=')
+                env[key] = value
+    return env
+
 def check_environment():
     """Check current environment configuration"""
     print("Current Environment Configuration")
@@ -110,17 +123,13 @@ def check_environment():
         print("✅ .env file exists")
         
         # Read and display key settings (without sensitive data)
-        with open('.env', 'r') as f:
-            lines = f.readlines()
-            
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                if 'PASSWORD' in line or 'API_KEY' in line:
-                    key = line.split('=')[0]
-                    print(f"  {key}=***hidden***")
-                else:
-                    print(f"  {line}")
+        env = _read_env_file(os.path.getmtime('.env'))
+        
+        for key, value in env.items():
+            if any(hidden in key for hidden in _HIDDEN_KEYS):
+                print(f"  {key}=***hidden***")
+            else:
+                print(f"  {key}={value}")
     else:
         print("❌ .env file not found")
     
@@ -7,8 +7,16 @@ Supports multiple LLM providers with knowledge building and fallback mechanisms
 import os
 import json
 import re
+import asyncio
+import functools
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 from .domain_mapping import DomainMapper
 from .database import get_database_manager
@@ -16,19 +24,199 @@ from .config import get_config
 from .llm_providers import LLMProviderManager
 from .knowledge_system import QueryKnowledgeSystem, EnhancedSchemaAnalyzer
 from .isa95_domain import ISA95DomainKnowledge, ISA95QueryEnhancer
-import anthropic
 
-# Load environment variables from .env file
+# Load environment variables from .env file (variables already set are kept)
 try:
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
     pass  # dotenv not installed, use system env vars
 
+# orjson parses batched JSON answers faster; the stdlib parser is the fallback
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+def _extract_sql(text: str) -> str:
+    """
+    Return the SQL in an LLM response, without surrounding whitespace or a
+    ``` / ```sql markdown fence, as one slice of the original text
+    """
+    start, end = 0, len(text)
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    
+    if text.startswith('```', start, end):
+        start += 3
+        if text.startswith('sql', start, end):
+            start += 3
+        while start < end and text[start].isspace():
+            start += 1
+    if end - start >= 3 and text.endswith('```', start, end):
+        end -= 3
+        while end > start and text[end - 1].isspace():
+            end -= 1
+    
+    return text[start:end]
+
+# Shared Claude client so instances reuse one HTTP connection pool
+_CLAUDE_CLIENT = None
+_CLAUDE_CLIENT_LOCK = threading.Lock()
+
+def _get_claude_client(api_key: str):
+    """Return the process-wide Anthropic client, creating it on first use"""
+    global _CLAUDE_CLIENT
+    if _CLAUDE_CLIENT is None:
+        with _CLAUDE_CLIENT_LOCK:
+            if _CLAUDE_CLIENT is None:
+                import anthropic
+                _CLAUDE_CLIENT = anthropic.Anthropic(api_key=api_key)
+    return _CLAUDE_CLIENT
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rule-based fallback patterns, compiled by _ensure_fallback_compiled() on first use
+_TIME_PATTERNS = None
+_COMPARISON_PATTERNS = None
+_WORD_RE = None
+
+def _ensure_fallback_compiled():
+    """Compile the fallback regexes once; runs that always get SQL from an LLM never need them"""
+    global _TIME_PATTERNS, _COMPARISON_PATTERNS, _WORD_RE
+    if _TIME_PATTERNS is not None:
+        return
+    
+    # Relative time expressions: (pattern, handler(match, now) -> (start, end))
+    time_patterns = [
+        (re.compile(r'\blast\s+week\b', re.IGNORECASE), lambda m, now: (now - timedelta(days=7), now)),
+        (re.compile(r'\bpast\s+week\b', re.IGNORECASE), lambda m, now: (now - timedelta(days=7), now)),
+        (re.compile(r'\bprevious\s+week\b', re.IGNORECASE), lambda m, now: (now - timedelta(days=7), now)),
+        (re.compile(r'\byesterday\b', re.IGNORECASE),
+         lambda m, now: (now - timedelta(days=1), now - timedelta(days=1) + timedelta(hours=23, minutes=59))),
+        (re.compile(r'\btoday\b', re.IGNORECASE), lambda m, now: (now.replace(hour=0, minute=0, second=0), now)),
+        (re.compile(r'\blast\s+(\d+)\s+days?\b', re.IGNORECASE),
+         lambda m, now: (now - timedelta(days=int(m.group(1))), now)),
+        (re.compile(r'\blast\s+(\d+)\s+hours?\b', re.IGNORECASE),
+         lambda m, now: (now - timedelta(hours=int(m.group(1))), now)),
+        (re.compile(r'\blast\s+month\b', re.IGNORECASE), lambda m, now: (now - timedelta(days=30), now)),
+        (re.compile(r'\bthis\s+week\b', re.IGNORECASE), lambda m, now: (now - timedelta(days=now.weekday()), now))
+    ]
+
+    # Value comparisons: (pattern, comparison type)
+    comparison_patterns = [
+        (re.compile(r'>\s*(\d+(?:\.\d+)?)'), 'GT'),
+        (re.compile(r'<\s*(\d+(?:\.\d+)?)'), 'LT'),
+        (re.compile(r'=\s*(\d+(?:\.\d+)?)'), 'EQ'),
+        (re.compile(r'above\s+(\d+(?:\.\d+)?)'), 'GT'),
+        (re.compile(r'below\s+(\d+(?:\.\d+)?)'), 'LT'),
+        (re.compile(r'over\s+(\d+(?:\.\d+)?)'), 'GT'),
+        (re.compile(r'under\s+(\d+(?:\.\d+)?)'), 'LT')
+    ]
+    
+    _WORD_RE = re.compile(r'\w+')
+    _COMPARISON_PATTERNS = comparison_patterns
+    # Assigned last: it is the "already compiled" flag
+    _TIME_PATTERNS = time_patterns
+
+# Intent keyword -> (bucket, value, priority); within a bucket the lowest priority wins
+_INTENT_KEYWORDS = {
+    word: (bucket, value, priority)
+    for priority, (bucket, value, words) in enumerate([
+        ('action', 'SELECT', ['which', 'what', 'show', 'find', 'get', 'list']),
+        ('action', 'COUNT', ['count']),
+        ('action', 'AVG', ['average', 'avg', 'mean']),
+        ('action', 'MAX', ['maximum', 'max', 'highest']),
+        ('action', 'MIN', ['minimum', 'min', 'lowest']),
+        ('condition', 'threshold_exceeded', ['crossed', 'exceeded', 'violated', 'breached']),
+        ('condition', 'status_offline', ['offline', 'disconnected', 'down']),
+        ('condition', 'status_online', ['online', 'connected', 'active'])
+    ])
+    for word in words
+}
+_COUNT_PRIORITY = _INTENT_KEYWORDS['count'][2]
+
+# Fallback SQL fragments, looked up from the extracted intent
+_ACTION_SELECTS = {
+    'COUNT': "SELECT COUNT(*)",
+    'AVG': "SELECT AVG(value)",
+    'MAX': "SELECT MAX(value)",
+    'MIN': "SELECT MIN(value)"
+}
+_ENTITY_SELECTS = {
+    'RepData': "SELECT device_id, sensor_type, value, unit, timestamp",
+    'AlertLog': "SELECT device_id, sensor_type, alert_type, actual_value, threshold_value, timestamp",
+    'DevMap': "SELECT device_id, device_name, status, location"
+}
+_STATUS_CONDITIONS = {
+    'status_offline': "status = 'offline'",
+    'status_online': "status = 'online'"
+}
+_COMPARISON_SQL = {'GT': "value > ?", 'LT': "value < ?", 'EQ': "value = ?"}
+_TIMESTAMPED_ENTITIES = frozenset(['RepData', 'AlertLog'])
+
+# Generated-SQL validation: leading command and explanation phrases that mark prose
+_SQL_START_RE = re.compile(r'\s*(?:SELECT|INSERT|UPDATE|DELETE|WITH)', re.IGNORECASE)
+_EXPLAIN_RE = re.compile(
+    r'THE PROVIDED|I CANNOT|PLEASE NOTE|HOWEVER|UNFORTUNATELY|SORRY|WITHOUT A CLEAR',
+    re.IGNORECASE
+)
+
+# On-disk cache of the prompt's schema section, keyed by a hash of the database type,
+# tables and columns (delete the directory to invalidate)
+PROMPT_CACHE_DIR = Path(os.getenv('IOT_LLM_CACHE_DIR', Path(__file__).parent.parent / '.cache'))
+
+# Leading columns projected into prompt sample rows (keeps wide tables cheap)
+SAMPLE_COLUMNS = 6
+
+# Queries sent per batched Claude prompt (accuracy drops off with larger batches)
+BATCH_QUERY_LIMIT = 8
+
+# Seconds between status polls of a Message Batches job
+BATCH_POLL_SECONDS = 30
+
+# Generated SQL kept per (source, normalized query, schema fingerprint)
+SQL_CACHE_SIZE = 1024
+_TRAILING_PUNCT = '?!.;, '
+
+# Successful Claude responses after which prompts stop embedding sample rows
+SAMPLE_PROMPT_WARMUP = 3
+
+# Static sections of the Claude prompt
+_CLAUDE_PROMPT_HEADER = """You are an expert SQL generator for an IoT database. Convert the natural language query into a valid SQLite query.
+
+"""
+
+_CLAUDE_PROMPT_RULES = """
+DOMAIN MAPPING RULES:
+- "signals", "sensor data", "readings" → RepData table
+- "alerts", "alarms", "notifications" → AlertLog table  
+- "devices", "equipment", "sensors" → DevMap table
+- "thresholds", "limits", "boundaries" → ThreshSet table
+- "locations", "sites", "facilities" → LocRef table
+- "logs", "calculated data", "analytics" → RepItem table
+
+TIME EXPRESSIONS:
+- "yesterday" = past 24 hours from yesterday
+- "today" = current day
+- "last week" = past 7 days
+- "last month" = past 30 days
+- Convert relative time to DATETIME comparisons
+
+QUERY RULES:
+1. Always use proper table aliases for readability
+2. Include appropriate WHERE clauses for time filtering
+3. Use JOINs when cross-referencing data (e.g., threshold violations)
+4. Limit results to 100 for SELECT queries unless specified
+5. Use ORDER BY timestamp DESC for time-series data
+6. For threshold violations, join RepData with ThreshSet and compare values
+"""
+
 class EnhancedQueryInterface:
     def __init__(self, database_manager=None, llm_config=None):
         """
@@ -40,6 +228,7 @@ class EnhancedQueryInterface:
         """
         self.config = get_config()
         self.mapper = DomainMapper()
+        api_key = os.getenv('ANTHROPIC_API_KEY')
         
         # Use provided database manager or create one
         if database_manager:
@@ -53,25 +242,30 @@ class EnhancedQueryInterface:
         if not self.db.connect():
             raise ConnectionError("Failed to connect to database")
         
-        print(f"✓ Connected to {self.db.get_database_type().upper()} database")
+        self._db_type = self.db.get_database_type()
+        logger.info("Connected to %s database", self._db_type.upper())
         
         # Initialize LLM provider manager
         default_llm_config = {
             'claude': {
-                'api_key': os.getenv('ANTHROPIC_API_KEY'),
+                'api_key': api_key,
                 'model': 'claude-3-haiku-20240307'
             },
             'openai': {
                 'api_key': os.getenv('OPENAI_API_KEY'),
                 'model': 'gpt-4'
             },
-            'fallback_order': ['claude', 'openai']
+            'fallback_order': ['claude', 'openai'],
+            # Route execute_natural_language_queries through the (slower, cheaper)
+            # Message Batches API; meant for offline/report runs
+            'use_batch_api': False
         }
         
         if llm_config:
             default_llm_config.update(llm_config)
         
         self.llm_manager = LLMProviderManager(default_llm_config)
+        self.use_batch_api = default_llm_config['use_batch_api']
         
         # Initialize knowledge system
         self.knowledge = QueryKnowledgeSystem()
@@ -85,156 +279,273 @@ class EnhancedQueryInterface:
         
         # Cache for schema context
         self._schema_context = None
+        self._schema_section = None
         self._schema_analysis = None
         self._isa95_context = None
+        self._schema_cache = None
+        self._sample_cache = None
+        self._sample_data_cache = {}  # (table, limit) -> rows from get_sample_data
+        self._prompt_prefixes = {}
+        self._schema_fingerprint = None
+        self._sql_cache = OrderedDict()  # LRU of generated SQL, see _sql_cache_key
+        
+        # Sample rows are sent until Claude has answered a few queries
+        self._include_samples = True
+        self._claude_successes = 0
         
-        print(f"✓ LLM providers initialized: {list(self.llm_manager.providers.keys())}")
-        print(f"✓ Current provider: {self.llm_manager.current_provider}")
-        print(f"✓ ISA-95 Manufacturing domain knowledge loaded")
+        logger.info("LLM providers initialized: %s", list(self.llm_manager.providers.keys()))
+        logger.info("Current provider: %s", self.llm_manager.current_provider)
+        logger.info("ISA-95 Manufacturing domain knowledge loaded")
         
         # Legacy Claude client for fallback
-        api_key = os.getenv('ANTHROPIC_API_KEY')
         if not api_key:
-            print("WARNING: ANTHROPIC_API_KEY not found. Set environment variable to use Claude API.")
-            print("Falling back to rule-based processing.")
+            logger.warning("ANTHROPIC_API_KEY not found. Set environment variable to use Claude API.")
+            logger.warning("Falling back to rule-based processing.")
             self.use_claude = False
             self.client = None
         else:
             try:
-                self.client = anthropic.Anthropic(api_key=api_key)
+                self.client = _get_claude_client(api_key)
                 self.use_claude = True
-                print("✓ Claude API initialized successfully")
+                logger.info("Claude API initialized successfully")
             except Exception as e:
-                print(f"ERROR: Failed to initialize Claude API: {e}")
-                print("Falling back to rule-based processing.")
+                logger.error("Failed to initialize Claude API: %s", e)
+                logger.error("Falling back to rule-based processing.")
                 self.use_claude = False
                 self.client = None
         
+        # Providers are fixed after construction; LLM-less deployments skip straight to the fallback
+        self._has_any_llm = bool(self.llm_manager.providers)
+        
     def get_database_schema(self) -> Dict:
-        """Get complete database schema for context"""
+        """Get complete database schema for context (cached after first call)"""
+        if self._schema_cache is not None:
+            return self._schema_cache
+        
         schema = {}
         
         # Get all tables using database abstraction
         tables = self.db.get_all_tables()
+        table_schemas = self.db.get_many_table_schemas(tables)
+        is_sqlite = self._db_type == 'sqlite'
         
         for table in tables:
-            columns = self.db.get_table_schema(table)
+            columns = table_schemas[table]
             
             # Normalize column info for different database types
-            normalized_columns = []
-            for col in columns:
-                if self.db.get_database_type() == 'sqlite':
-                    # SQLite PRAGMA table_info format
-                    normalized_columns.append({
-                        'name': col.get('name', ''),
-                        'type': col.get('type', ''),
-                        'notnull': col.get('notnull', 0),
-                        'pk': col.get('pk', 0)
-                    })
-                else:
-                    # Oracle all_tab_columns format
-                    normalized_columns.append({
-                        'name': col.get('column_name', ''),
-                        'type': col.get('data_type', ''),
-                        'notnull': 1 if col.get('nullable') == 'N' else 0,
-                        'pk': 0  # Would need additional query for PK info
-                    })
+            if is_sqlite:
+                # SQLite PRAGMA table_info format
+                normalized_columns = [{
+                    'name': col.get('name', ''),
+                    'type': col.get('type', ''),
+                    'notnull': col.get('notnull', 0),
+                    'pk': col.get('pk', 0)
+                } for col in columns]
+            else:
+                # Oracle all_tab_columns format
+                normalized_columns = [{
+                    'name': col.get('column_name', ''),
+                    'type': col.get('data_type', ''),
+                    'notnull': 1 if col.get('nullable') == 'N' else 0,
+                    'pk': 0  # Would need additional query for PK info
+                } for col in columns]
             
             schema[table] = {
                 'columns': normalized_columns,
                 'domain_names': self.mapper.reverse_lookup_table(table)
             }
         
+        self._schema_cache = schema
         return schema
     
+    def invalidate_schema_cache(self):
+        """Drop cached schema, sample data and schema context (call after DDL changes)"""
+        self._schema_cache = None
+        self._sample_cache = None
+        self._sample_data_cache = {}
+        self._schema_context = None
+        self._schema_section = None
+        self._prompt_prefixes = {}
+        self._schema_fingerprint = None
+        self._sql_cache.clear()
+    
+    def _sql_cache_key(self, source: str, query: str, query_lower: str = None) -> Tuple[str, str, str]:
+        """Key generated SQL on its source, the normalized query and the schema fingerprint"""
+        if self._schema_fingerprint is None:
+            schema_json = json.dumps(self.get_database_schema(), sort_keys=True, default=str)
+            self._schema_fingerprint = hashlib.blake2b(schema_json.encode()).hexdigest()[:16]
+        # Case, spacing and trailing punctuation only; operators like > and < carry meaning
+        if query_lower is None:
+            query_lower = query.lower()
+        normalized = ' '.join(query_lower.split()).rstrip(_TRAILING_PUNCT)
+        return source, normalized, self._schema_fingerprint
+    
+    def _sql_cache_get(self, key: Tuple[str, str, str]):
+        """Return a cached generation for key (marking it recently used), or None"""
+        value = self._sql_cache.get(key)
+        if value is not None:
+            self._sql_cache.move_to_end(key)
+        return value
+    
+    def _sql_cache_put(self, key: Tuple[str, str, str], value):
+        """Store a generation, evicting the least recently used beyond SQL_CACHE_SIZE"""
+        self._sql_cache[key] = value
+        self._sql_cache.move_to_end(key)
+        if len(self._sql_cache) > SQL_CACHE_SIZE:
+            self._sql_cache.popitem(last=False)
+    
+    def _sample_data_sql(self, table: str, limit: int, columns: List[str] = None) -> str:
+        """Build the sample-row query for a table in the current SQL dialect"""
+        sql = f"SELECT {','.join(columns) if columns else '*'} FROM {table}"
+        if self._db_type == 'oracle':
+            sql += f" WHERE ROWNUM <= {limit}"
+        else:
+            sql += f" LIMIT {limit}"
+        return sql
+    
     def get_sample_data(self, table: str, limit: int = 3) -> List[Dict]:
-        """Get sample data from a table for context"""
+        """Get sample data from a table for context (memoized until invalidate_schema_cache)"""
+        key = (table, limit)
+        if key in self._sample_data_cache:
+            return self._sample_data_cache[key]
         try:
             # Use database abstraction layer
-            sql = f"SELECT * FROM {table}"
-            if self.db.get_database_type() == 'oracle':
-                sql += f" WHERE ROWNUM <= {limit}"
-            else:
-                sql += f" LIMIT {limit}"
-            
-            return self.db.execute_query(sql)
+            rows = self.db.execute_query(self._sample_data_sql(table, limit))
+            self._sample_data_cache[key] = rows
+            return rows
         except Exception as e:
-            print(f"Warning: Could not get sample data from {table}: {e}")
+            logger.warning("Could not get sample data from %s: %s", table, e)
             return []
     
-    def create_claude_prompt(self, query: str) -> str:
-        """Create a detailed prompt for Claude to generate SQL"""
-        schema = self.get_database_schema()
+    def get_sample_data_for_tables(self, tables: Dict[str, List[str]], limit: int = 3,
+                                   column_types: Dict[str, List[str]] = None) -> Dict[str, List[Tuple]]:
+        """
+        Get sample rows for several tables with a single UNION ALL database call
         
-        # Get sample data for context
-        sample_data = {}
-        for table in schema.keys():
-            sample_data[table] = self.get_sample_data(table, 2)
+        Args:
+            tables: Table name -> columns to project
+            limit: Rows per table
+            column_types: Optional table name -> declared column types, so the backend
+                          only casts columns whose type allows it
         
-        prompt = f"""You are an expert SQL generator for an IoT database. Convert the natural language query into a valid SQLite query.
-
-DATABASE SCHEMA:
-"""
+        Returns:
+            Table name -> list of raw row tuples
+        """
+        try:
+            return self.db.get_sample_data_bulk(tables, limit, column_types)
+        except Exception as e:
+            logger.debug("Bulk sample fetch failed, fetching per table: %s", e)
         
-        for table, info in schema.items():
-            columns_info = []
-            for col in info['columns']:
-                pk_marker = " (PRIMARY KEY)" if col['pk'] else ""
-                columns_info.append(f"  - {col['name']} ({col['type']}){pk_marker}")
-            
-            domain_names = ", ".join(info['domain_names']) if info['domain_names'] else "None"
-            
-            prompt += f"""
-Table: {table}
-Domain Names: {domain_names}
-Columns:
-""" + "\n".join(columns_info)
-            
-            if sample_data.get(table):
-                prompt += f"\nSample Data:\n"
-                for i, row in enumerate(sample_data[table], 1):
-                    prompt += f"  Row {i}: {row}\n"
-            prompt += "\n"
+        # Fall back to per-table fetches (run concurrently) so one unreadable table
+        # doesn't drop all samples
+        results = self.db.execute_queries_concurrently(
+            [self._sample_data_sql(table, limit, columns) for table, columns in tables.items()]
+        )
+        samples = {}
+        for table, rows in zip(tables, results):
+            if isinstance(rows, Exception):
+                logger.warning("Could not get sample data from %s: %s", table, rows)
+                rows = []
+            samples[table] = rows
+        return samples
+    
+    def create_claude_prompt(self, query: str, include_samples: bool = None) -> str:
+        """
+        Create a detailed prompt for Claude to generate SQL
         
-        prompt += f"""
-DOMAIN MAPPING RULES:
-- "signals", "sensor data", "readings" → RepData table
-- "alerts", "alarms", "notifications" → AlertLog table  
-- "devices", "equipment", "sensors" → DevMap table
-- "thresholds", "limits", "boundaries" → ThreshSet table
-- "locations", "sites", "facilities" → LocRef table
-- "logs", "calculated data", "analytics" → RepItem table
-
-TIME EXPRESSIONS:
-- "yesterday" = past 24 hours from yesterday
-- "today" = current day
-- "last week" = past 7 days
-- "last month" = past 30 days
-- Convert relative time to DATETIME comparisons
-
-QUERY RULES:
-1. Always use proper table aliases for readability
-2. Include appropriate WHERE clauses for time filtering
-3. Use JOINs when cross-referencing data (e.g., threshold violations)
-4. Limit results to 100 for SELECT queries unless specified
-5. Use ORDER BY timestamp DESC for time-series data
-6. For threshold violations, join RepData with ThreshSet and compare values
-
+        Args:
+            query: Natural language query
+            include_samples: Embed sample rows per table. Defaults to True until
+                             SAMPLE_PROMPT_WARMUP queries have succeeded; after that
+                             the schema alone is enough and the sample fetch is skipped.
+        """
+        return self._claude_prompt_prefix(include_samples) + self._claude_query_suffix(query)
+    
+    def create_claude_message_content(self, query: str, include_samples: bool = None) -> List[Dict]:
+        """
+        Create the Claude prompt as message content blocks
+        
+        The schema/rules prefix is marked with cache_control so the API can reuse it
+        across calls; only the query block is processed fresh each time.
+        """
+        return self._cached_prefix_content(self._claude_query_suffix(query), include_samples)
+    
+    def create_claude_batch_prompt(self, queries: List[str], include_samples: bool = None) -> List[Dict]:
+        """Create message content asking Claude for SQL for several queries, answered as JSON"""
+        return self._cached_prefix_content(self._claude_batch_suffix(queries), include_samples)
+    
+    def _claude_query_suffix(self, query: str) -> str:
+        return f"""
 NATURAL LANGUAGE QUERY: "{query}"
 
 Generate ONLY the SQL query without explanation. The query should be executable SQLite syntax.
 
 SQL Query:"""
+    
+    def _claude_batch_suffix(self, queries: List[str]) -> str:
+        numbered = "\n".join(f"{i}. {query}" for i, query in enumerate(queries, 1))
+        return f"""
+NATURAL LANGUAGE QUERIES:
+{numbered}
+
+Generate one executable SQLite query per natural language query, without explanation.
+Return ONLY a JSON array in this form: [{{"idx": 1, "sql": "..."}}, {{"idx": 2, "sql": "..."}}]
+
+JSON:"""
+    
+    def _cached_prefix_content(self, suffix: str, include_samples: bool = None) -> List[Dict]:
+        """Content blocks: the prompt prefix marked for prompt caching, then the per-call suffix"""
+        return [
+            {
+                "type": "text",
+                "text": self._claude_prompt_prefix(include_samples),
+                "cache_control": {"type": "ephemeral"}
+            },
+            {"type": "text", "text": suffix}
+        ]
+    
+    def _claude_prompt_prefix(self, include_samples: bool = None) -> str:
+        """Return the cached query-independent prompt prefix"""
+        if include_samples is None:
+            include_samples = self._include_samples
         
-        return prompt
+        prefix = self._prompt_prefixes.get(include_samples)
+        if prefix is None:
+            prefix = self._build_claude_prompt_prefix(include_samples)
+            self._prompt_prefixes[include_samples] = prefix
+        return prefix
+    
+    def _build_claude_prompt_prefix(self, include_samples: bool = True) -> str:
+        """Build the query-independent part of the Claude prompt (schema context, samples, rules)"""
+        if not include_samples:
+            # Same cached context the LLM providers get; nothing is rebuilt
+            return _CLAUDE_PROMPT_HEADER + self._get_enhanced_schema_context() + _CLAUDE_PROMPT_RULES
+        
+        # Get sample data for context (fetched once per schema cache)
+        if self._sample_cache is None:
+            schema = self.get_database_schema()
+            self._sample_cache = self.get_sample_data_for_tables(
+                {table: [col['name'] for col in info['columns'][:SAMPLE_COLUMNS]]
+                 for table, info in schema.items()},
+                2,
+                {table: [col['type'] for col in info['columns'][:SAMPLE_COLUMNS]]
+                 for table, info in schema.items()}
+            )
+        
+        return _CLAUDE_PROMPT_HEADER + self._build_schema_context(self._sample_cache) + _CLAUDE_PROMPT_RULES
     
     def generate_sql_with_claude(self, query: str) -> Tuple[str, bool]:
         """Use Claude API to generate SQL from natural language"""
         if not self.use_claude or not self.client:
             return None, False
         
+        cache_key = self._sql_cache_key('claude-direct', query)
+        cached_sql = self._sql_cache_get(cache_key)
+        if cached_sql is not None:
+            return cached_sql, True
+        
         try:
-            prompt = self.create_claude_prompt(query)
+            prompt = self.create_claude_message_content(query)
             
             response = self.client.messages.create(
                 model="claude-3-haiku-20240307",
@@ -245,56 +556,127 @@ SQL Query:"""
                 ]
             )
             
-            sql = response.content[0].text.strip()
-            
-            # Clean up the SQL (remove markdown formatting if present)
-            sql = re.sub(r'^```sql\s*', '', sql, flags=re.MULTILINE)
-            sql = re.sub(r'^```\s*$', '', sql, flags=re.MULTILINE)
-            sql = sql.strip()
+            sql = _extract_sql(response.content[0].text)
             
-            print(f"🤖 Claude generated SQL: {sql}")
+            logger.debug("Claude generated SQL: %s", sql)
+            self._claude_successes += 1
+            if self._claude_successes >= SAMPLE_PROMPT_WARMUP:
+                self._include_samples = False
+            self._sql_cache_put(cache_key, sql)
             return sql, True
             
         except Exception as e:
-            print(f"❌ Claude API error: {e}")
+            logger.error("Claude API error: %s", e)
             return None, False
     
+    def generate_sql_batch(self, queries: List[str],
+                           poll_interval: float = BATCH_POLL_SECONDS) -> List[Tuple[Optional[str], bool]]:
+        """
+        Generate SQL for many queries through the Anthropic Message Batches API
+        
+        Batch jobs are billed at a discount but may take minutes to finish, so this
+        blocks while polling and is meant for offline/report workloads only.
+        
+        Returns:
+            One (sql, used_claude) tuple per query, like generate_sql_with_claude
+        """
+        results = [(None, False)] * len(queries)
+        if not self.use_claude or not self.client or not queries:
+            return results
+        
+        try:
+            batch = self.client.messages.batches.create(requests=[
+                {
+                    "custom_id": f"q{i}",
+                    "params": {
+                        "model": "claude-3-haiku-20240307",
+                        "max_tokens": 1000,
+                        "temperature": 0.1,
+                        "messages": [{"role": "user", "content": self.create_claude_message_content(query)}]
+                    }
+                }
+                for i, query in enumerate(queries)
+            ])
+            
+            while batch.processing_status != "ended":
+                time.sleep(poll_interval)
+                batch = self.client.messages.batches.retrieve(batch.id)
+            
+            for entry in self.client.messages.batches.results(batch.id):
+                if entry.result.type == "succeeded":
+                    sql = _extract_sql(entry.result.message.content[0].text)
+                    results[int(entry.custom_id[1:])] = (sql, True)
+                else:
+                    logger.warning("Claude batch request %s %s", entry.custom_id, entry.result.type)
+            
+            logger.debug("Claude batch %s generated SQL for %d/%d queries",
+                         batch.id, sum(ok for _, ok in results), len(queries))
+            return results
+            
+        except Exception as e:
+            logger.error("Claude batch API error: %s", e)
+            return [(None, False)] * len(queries)
+    
+    def generate_sql_batch_with_claude(self, queries: List[str]) -> List[Optional[str]]:
+        """
+        Use one Claude API call to generate SQL for several queries
+        
+        Returns:
+            One SQL string per query, or None where Claude gave no usable SQL
+        """
+        if not self.use_claude or not self.client or not queries:
+            return [None] * len(queries)
+        
+        try:
+            response = self.client.messages.create(
+                model="claude-3-haiku-20240307",
+                max_tokens=min(4096, 1000 * len(queries)),
+                temperature=0.1,
+                messages=[
+                    {"role": "user", "content": self.create_claude_batch_prompt(queries)}
+                ]
+            )
+            
+            text = response.content[0].text
+            # Tolerate markdown fences or stray prose around the JSON array
+            items = _json_loads(text[text.index('['):text.rindex(']') + 1])
+            by_idx = {item['idx']: item['sql'].strip() for item in items
+                      if isinstance(item, dict) and isinstance(item.get('sql'), str)}
+        except Exception as e:
+            logger.error("Claude batch API error: %s", e)
+            return [None] * len(queries)
+        
+        sqls = []
+        for i in range(1, len(queries) + 1):
+            sql = by_idx.get(i)
+            sqls.append(sql if self._is_valid_sql(sql) else None)
+        logger.debug("Claude generated SQL for %d/%d batched queries",
+                     sum(sql is not None for sql in sqls), len(queries))
+        return sqls
+    
     def parse_time_expressions(self, query: str) -> Tuple[str, Optional[datetime], Optional[datetime]]:
         """Parse time expressions from natural language"""
-        query_lower = query.lower()
-        now = datetime.now()
+        _ensure_fallback_compiled()
         start_date = None
         end_date = None
         modified_query = query
         
-        # Time patterns
-        time_patterns = {
-            r'\blast\s+week\b': (now - timedelta(days=7), now),
-            r'\bpast\s+week\b': (now - timedelta(days=7), now),
-            r'\bprevious\s+week\b': (now - timedelta(days=7), now),
-            r'\byesterday\b': (now - timedelta(days=1), now - timedelta(days=1) + timedelta(hours=23, minutes=59)),
-            r'\btoday\b': (now.replace(hour=0, minute=0, second=0), now),
-            r'\blast\s+(\d+)\s+days?\b': lambda m: (now - timedelta(days=int(m.group(1))), now),
-            r'\blast\s+(\d+)\s+hours?\b': lambda m: (now - timedelta(hours=int(m.group(1))), now),
-            r'\blast\s+month\b': (now - timedelta(days=30), now),
-            r'\bthis\s+week\b': (now - timedelta(days=now.weekday()), now)
-        }
-        
-        for pattern, time_range in time_patterns.items():
-            match = re.search(pattern, query_lower)
+        # Patterns are case-insensitive, so match the original text without lowering it
+        for pattern, time_range in _TIME_PATTERNS:
+            match = pattern.search(query)
             if match:
-                if callable(time_range):
-                    start_date, end_date = time_range(match)
-                else:
-                    start_date, end_date = time_range
-                modified_query = re.sub(pattern, '', query, flags=re.IGNORECASE).strip()
+                # Only read the clock once a time expression has matched
+                start_date, end_date = time_range(match, datetime.now())
+                modified_query = pattern.sub('', query).strip()
                 break
         
         return modified_query, start_date, end_date
     
-    def extract_query_intent(self, query: str) -> Dict:
+    def extract_query_intent(self, query: str, query_lower: str = None) -> Dict:
         """Extract intent and entities from natural language query (fallback method)"""
-        query_lower = query.lower()
+        _ensure_fallback_compiled()
+        if query_lower is None:
+            query_lower = query.lower()
         intent = {
             'action': None,
             'entity': None,
@@ -304,45 +686,39 @@ SQL Query:"""
             'value': None
         }
         
-        # Action patterns
-        if any(word in query_lower for word in ['which', 'what', 'show', 'find', 'get', 'list']):
-            intent['action'] = 'SELECT'
-        elif any(word in query_lower for word in ['count', 'how many']):
-            intent['action'] = 'COUNT'
-        elif any(word in query_lower for word in ['average', 'avg', 'mean']):
-            intent['action'] = 'AVG'
-        elif any(word in query_lower for word in ['maximum', 'max', 'highest']):
-            intent['action'] = 'MAX'
-        elif any(word in query_lower for word in ['minimum', 'min', 'lowest']):
-            intent['action'] = 'MIN'
-        
-        # Entity extraction
-        for domain_term, table in self.mapper.table_mappings.items():
-            if domain_term in query_lower:
-                intent['entity'] = table
-                break
+        # Single pass over the query words classifies every keyword bucket at once
+        best = {}
+        entity_rank = None
+        term_rank = self.mapper.term_rank()
+        for word in _WORD_RE.findall(query_lower):
+            hit = _INTENT_KEYWORDS.get(word)
+            if hit:
+                bucket, value, priority = hit
+                if bucket not in best or priority < best[bucket][0]:
+                    best[bucket] = (priority, value)
+            rank = term_rank.get(word)
+            if rank is not None and (entity_rank is None or rank < entity_rank):
+                entity_rank = rank
+                intent['entity'] = self.mapper.table_mappings[word]
         
-        # Condition patterns
-        if any(word in query_lower for word in ['crossed', 'exceeded', 'violated', 'breached']):
-            intent['condition'] = 'threshold_exceeded'
-        elif any(word in query_lower for word in ['offline', 'disconnected', 'down']):
-            intent['condition'] = 'status_offline'
-        elif any(word in query_lower for word in ['online', 'connected', 'active']):
-            intent['condition'] = 'status_online'
+        # Multi-word domain terms can't be token matches; search them only as a last resort
+        if intent['entity'] is None:
+            for term, table in self.mapper.multi_word_terms():
+                if term in query_lower:
+                    intent['entity'] = table
+                    break
         
-        # Comparison and values
-        comparison_patterns = [
-            (r'>\s*(\d+(?:\.\d+)?)', 'GT'),
-            (r'<\s*(\d+(?:\.\d+)?)', 'LT'),
-            (r'=\s*(\d+(?:\.\d+)?)', 'EQ'),
-            (r'above\s+(\d+(?:\.\d+)?)', 'GT'),
-            (r'below\s+(\d+(?:\.\d+)?)', 'LT'),
-            (r'over\s+(\d+(?:\.\d+)?)', 'GT'),
-            (r'under\s+(\d+(?:\.\d+)?)', 'LT')
-        ]
+        if 'how many' in query_lower:
+            action = best.get('action')
+            if action is None or action[0] > _COUNT_PRIORITY:
+                best['action'] = (_COUNT_PRIORITY, 'COUNT')
+        
+        for bucket, (priority, value) in best.items():
+            intent[bucket] = value
         
-        for pattern, comp_type in comparison_patterns:
-            match = re.search(pattern, query_lower)
+        # Comparison and values
+        for pattern, comp_type in _COMPARISON_PATTERNS:
+            match = pattern.search(query_lower)
             if match:
                 intent['comparison'] = comp_type
                 intent['value'] = float(match.group(1))
@@ -351,9 +727,9 @@ SQL Query:"""
         return intent
     
     def build_sql_query_fallback(self, query: str, start_date: Optional[datetime] = None, 
-                       end_date: Optional[datetime] = None) -> Tuple[str, List]:
+                       end_date: Optional[datetime] = None, query_lower: str = None) -> Tuple[str, List]:
         """Build SQL query using rule-based approach (fallback)"""
-        intent = self.extract_query_intent(query)
+        intent = self.extract_query_intent(query, query_lower)
         params = []
         
         # Default to signal data if no entity detected
@@ -361,19 +737,7 @@ SQL Query:"""
             intent['entity'] = 'RepData'
         
         # Build SELECT clause
-        if intent['action'] == 'COUNT':
-            select_clause = "SELECT COUNT(*)"
-        elif intent['action'] in ['AVG', 'MAX', 'MIN']:
-            select_clause = f"SELECT {intent['action']}(value)"
-        else:
-            if intent['entity'] == 'RepData':
-                select_clause = "SELECT device_id, sensor_type, value, unit, timestamp"
-            elif intent['entity'] == 'AlertLog':
-                select_clause = "SELECT device_id, sensor_type, alert_type, actual_value, threshold_value, timestamp"
-            elif intent['entity'] == 'DevMap':
-                select_clause = "SELECT device_id, device_name, status, location"
-            else:
-                select_clause = "SELECT *"
+        select_clause = _ACTION_SELECTS.get(intent['action']) or _ENTITY_SELECTS.get(intent['entity'], "SELECT *")
         
         # Build FROM clause
         from_clause = f"FROM {intent['entity']}"
@@ -398,19 +762,12 @@ SQL Query:"""
                 where_conditions.append("(r.value > t.max_value OR r.value < t.min_value)")
             elif intent['entity'] == 'AlertLog':
                 where_conditions.append("alert_type = 'threshold_exceeded'")
-        elif intent['condition'] == 'status_offline':
-            where_conditions.append("status = 'offline'")
-        elif intent['condition'] == 'status_online':
-            where_conditions.append("status = 'online'")
+        elif intent['condition'] in _STATUS_CONDITIONS:
+            where_conditions.append(_STATUS_CONDITIONS[intent['condition']])
         
         # Value comparisons
         if intent['comparison'] and intent['value'] is not None:
-            if intent['comparison'] == 'GT':
-                where_conditions.append("value > ?")
-            elif intent['comparison'] == 'LT':
-                where_conditions.append("value < ?")
-            elif intent['comparison'] == 'EQ':
-                where_conditions.append("value = ?")
+            where_conditions.append(_COMPARISON_SQL[intent['comparison']])
             params.append(intent['value'])
         
         # Construct final query
@@ -419,9 +776,7 @@ SQL Query:"""
             sql += " WHERE " + " AND ".join(where_conditions)
         
         # Add ORDER BY for better results
-        if intent['entity'] == 'RepData':
-            sql += " ORDER BY timestamp DESC"
-        elif intent['entity'] == 'AlertLog':
+        if intent['entity'] in _TIMESTAMPED_ENTITIES:
             sql += " ORDER BY timestamp DESC"
         
         # Add LIMIT for large result sets
@@ -432,45 +787,165 @@ SQL Query:"""
     
     def execute_natural_language_query(self, query: str) -> Dict:
         """Execute a natural language query against the IoT database with enhanced LLM support"""
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
+        logger.debug("Processing query: %s", query)
+        query_lower = query.lower()  # computed once and passed down
         
-        try:
-            print(f"🔍 Processing query: {query}")
-            
-            # Get similar examples from knowledge system
-            examples = self.knowledge.get_similar_examples(query, limit=3)
-            
-            # Build enhanced schema context
-            context = self._get_enhanced_schema_context()
-            
-            sql = None
-            params = []
-            provider_info = None
-            
-            # Try LLM providers first with ISA-95 enhancement
+        sql = None
+        provider_info = None
+        
+        # Try LLM providers first with ISA-95 enhancement; the examples and
+        # schema context are only needed (and built) when a provider exists
+        if self._has_any_llm:
             try:
-                # Apply ISA-95 manufacturing term mapping
-                enhanced_query = self.isa95_domain.map_manufacturing_terms(query)
-                
-                sql, provider_info = self.llm_manager.generate_sql(enhanced_query, context, examples)
-                print(f"🤖 {provider_info['provider'].title()} generated SQL: {sql}")
-                
-                # Check if SQL contains parameters or is just explanatory text
-                if not self._is_valid_sql(sql):
-                    raise Exception("Generated response is not valid SQL")
-                    
+                cache_key, cached, request = self._prepare_llm_sql(query, query_lower)
+                sql, provider_info = cached or self._accept_llm_sql(
+                    cache_key, *self.llm_manager.generate_sql(*request))
             except Exception as e:
-                print(f"❌ LLM providers failed: {e}")
-                print("📝 Using fallback rule-based processing...")
+                logger.warning("LLM providers failed: %s", e)
+                sql = None
+        
+        return self._complete_query(query, sql, provider_info, start_ns, self.knowledge.record_query,
+                                    query_lower)
+    
+    async def aexecute_natural_language_query(self, query: str) -> Dict:
+        """
+        Async variant of execute_natural_language_query
+        
+        The provider call and the SQL execution run in worker threads (the database
+        backends keep one connection per thread), so the event loop can serve other
+        queries while either waits. The knowledge store's sqlite connection is bound to
+        the thread that created it, so the few-shot example lookup stays on the loop
+        thread and the knowledge record is handed back to the loop to run after the
+        result is returned.
+        """
+        start_ns = time.monotonic_ns()
+        logger.debug("Processing query: %s", query)
+        query_lower = query.lower()  # computed once and passed down
+        
+        sql = None
+        provider_info = None
+        
+        if self._has_any_llm:
+            try:
+                cache_key, cached, request = self._prepare_llm_sql(query, query_lower)
+                sql, provider_info = cached or self._accept_llm_sql(
+                    cache_key, *await asyncio.to_thread(self.llm_manager.generate_sql, *request))
+            except Exception as e:
+                logger.warning("LLM providers failed: %s", e)
+                sql = None
+        
+        loop = asyncio.get_running_loop()
+        
+        def record_later(**kwargs):
+            loop.call_soon_threadsafe(functools.partial(self.knowledge.record_query, **kwargs))
+        
+        return await asyncio.to_thread(self._complete_query, query, sql, provider_info, start_ns,
+                                       record_later, query_lower)
+    
+    def execute_natural_language_queries(self, queries: List[str]) -> List[Dict]:
+        """
+        Execute several natural language queries, sharing one Claude prompt per batch
+        
+        Queries are sent in groups of at most BATCH_QUERY_LIMIT so the schema prompt is
+        paid once per group, or as one Message Batches job when use_batch_api is set.
+        Any query the batch answer doesn't cover goes through
+        execute_natural_language_query as usual.
+        """
+        if self.use_batch_api:
+            start_ns = time.monotonic_ns()
+            sqls = [sql if self._is_valid_sql(sql) else None for sql, _ in self.generate_sql_batch(queries)]
+            return self._complete_queries(queries, sqls, time.monotonic_ns() - start_ns)
+        
+        results = []
+        for offset in range(0, len(queries), BATCH_QUERY_LIMIT):
+            batch = queries[offset:offset + BATCH_QUERY_LIMIT]
+            start_ns = time.monotonic_ns()
+            sqls = self.generate_sql_batch_with_claude(batch)
+            results.extend(self._complete_queries(batch, sqls, time.monotonic_ns() - start_ns))
+        return results
+    
+    def _complete_queries(self, queries: List[str], sqls: List[Optional[str]], generation_ns: int) -> List[Dict]:
+        """
+        Execute Claude's batched SQL, sending unanswered queries down the single-query path
+        
+        Each query is timed from its own start, plus an equal share of generation_ns
+        (the time spent generating the batch's SQL).
+        """
+        provider_info = {'provider': 'claude', 'model': 'claude-3-haiku-20240307'}
+        share_ns = generation_ns // max(len(queries), 1)
+        results = []
+        for query, sql in zip(queries, sqls):
+            if sql is None:
+                results.append(self.execute_natural_language_query(query))
+            else:
+                results.append(self._complete_query(query, sql, provider_info,
+                                                    time.monotonic_ns() - share_ns,
+                                                    self.knowledge.record_query))
+        return results
+    
+    def _prepare_llm_sql(self, query: str, query_lower: str = None) -> Tuple[Tuple, Optional[Tuple], Optional[Tuple]]:
+        """
+        LLM step shared by the sync and async query paths, up to the provider call
+        
+        Returns:
+            (cache_key, cached, request): cached is the query's (sql, provider_info) from the
+            SQL cache; on a miss it is None and request holds the provider call's arguments
+        """
+        cache_key = self._sql_cache_key(self.llm_manager.current_provider, query, query_lower)
+        cached = self._sql_cache_get(cache_key)
+        if cached is not None:
+            return cache_key, cached, None
+        return cache_key, None, self._llm_request(query, query_lower)
+    
+    def _accept_llm_sql(self, cache_key: Tuple, sql: str, provider_info: Dict) -> Tuple[str, Dict]:
+        """LLM step after the provider call: validate the generated SQL and cache it"""
+        self._check_llm_sql(sql, provider_info)
+        self._sql_cache_put(cache_key, (sql, provider_info))
+        return sql, provider_info
+    
+    def _llm_request(self, query: str, query_lower: str = None) -> Tuple[str, str, List[Dict]]:
+        """Build the (query, context, examples) arguments for an LLM provider call"""
+        # Get similar examples from knowledge system
+        examples = self.knowledge.get_similar_examples(query, limit=3)
+        
+        # Build enhanced schema context
+        context = self._get_enhanced_schema_context()
+        
+        # Apply ISA-95 manufacturing term mapping
+        enhanced_query = self.isa95_domain.map_manufacturing_terms(query, query_lower)
+        
+        return enhanced_query, context, examples
+    
+    def _check_llm_sql(self, sql: str, provider_info: Dict):
+        """Reject provider output that is explanatory text rather than SQL"""
+        logger.debug("%s generated SQL: %s", provider_info['provider'].title(), sql)
+        
+        # Check if SQL contains parameters or is just explanatory text
+        if not self._is_valid_sql(sql):
+            raise Exception("Generated response is not valid SQL")
+    
+    def _complete_query(self, query: str, sql: Optional[str], provider_info: Optional[Dict],
+                        start_ns: int, record_query, query_lower: str = None) -> Dict:
+        """Fall back to rule-based SQL if needed, execute it and record the outcome"""
+        params = []
+        
+        try:
+            if sql is None:
+                logger.debug("Using fallback rule-based processing")
                 # Parse time expressions for fallback
                 cleaned_query, start_date, end_date = self.parse_time_expressions(query)
                 # Build SQL query using fallback method
-                sql, params = self.build_sql_query_fallback(cleaned_query, start_date, end_date)
+                # The lowered query still applies when no time expression was removed
+                sql, params = self.build_sql_query_fallback(
+                    cleaned_query, start_date, end_date,
+                    query_lower if cleaned_query is query else None
+                )
                 provider_info = {'provider': 'fallback', 'model': 'rule-based'}
             
-            print(f"🗃️ Executing SQL: {sql}")
+            logger.debug("Executing SQL: %s", sql)
             if params:
-                print(f"📊 Parameters: {params}")
+                logger.debug("Parameters: %s", params)
             
             # Execute query using database abstraction
             if params:
@@ -478,11 +953,11 @@ SQL Query:"""
             else:
                 formatted_results = self.db.execute_query(sql)
             
-            execution_time = (datetime.now() - start_time).total_seconds() * 1000
-            print(f"✅ Found {len(formatted_results)} results")
+            execution_time = (time.monotonic_ns() - start_ns) / 1e6
+            logger.debug("Found %d results", len(formatted_results))
             
             # Record successful query in knowledge system
-            self.knowledge.record_query(
+            record_query(
                 natural_query=query,
                 generated_sql=sql,
                 execution_success=True,
@@ -508,18 +983,18 @@ SQL Query:"""
             manufacturing_insights = self.isa95_enhancer.suggest_manufacturing_insights(query_result)
             if manufacturing_insights:
                 query_result['manufacturing_insights'] = manufacturing_insights
-                print(f"🏭 Manufacturing Insights: {'; '.join(manufacturing_insights[:2])}")  # Show first 2 insights
+                logger.debug("Manufacturing Insights: %s", '; '.join(manufacturing_insights[:2]))  # Show first 2 insights
             
             return query_result
             
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds() * 1000
+            execution_time = (time.monotonic_ns() - start_ns) / 1e6
             error_msg = str(e)
-            print(f"❌ Error: {error_msg}")
+            logger.error("Query failed: %s", error_msg)
             
             # Record failed query for learning
-            if 'sql' in locals() and sql:
-                self.knowledge.record_query(
+            if sql:
+                record_query(
                     natural_query=query,
                     generated_sql=sql,
                     execution_success=False,
@@ -532,7 +1007,7 @@ SQL Query:"""
                 'success': False,
                 'query': query,
                 'error': error_msg,
-                'sql': sql if 'sql' in locals() else None,
+                'sql': sql,
                 'provider_used': provider_info.get('provider', 'unknown') if provider_info else 'unknown'
             }
     
@@ -566,85 +1041,134 @@ SQL Query:"""
     def _get_enhanced_schema_context(self) -> str:
         """Build enhanced schema context with knowledge insights and ISA-95 domain knowledge"""
         if self._schema_context is None:
-            # Get basic schema
-            schema = self.get_database_schema()
+            self._schema_context = self._build_schema_context()
+        return self._schema_context
+    
+    def _get_schema_section(self) -> str:
+        """Return the schema section of the context, read from the disk cache when the schema is unchanged"""
+        if self._schema_section is None:
+            self._schema_section = self._load_schema_section()
+        return self._schema_section
+    
+    def _load_schema_section(self) -> str:
+        """Read the schema section from the disk cache, building and storing it on a miss"""
+        # Only what the section is built from goes into the key; samples and learned
+        # knowledge change as the databases grow and are added per process instead
+        schema = self.get_database_schema()
+        signature = {
+            'db_type': self._db_type,
+            'tables': {
+                table: [[col['name'], col['type'], col['pk']] for col in info['columns']]
+                for table, info in schema.items()
+            },
+            'domain_names': {table: info['domain_names'] for table, info in schema.items()}
+        }
+        key = hashlib.sha1(json.dumps(signature, sort_keys=True, default=str).encode()).hexdigest()
+        cache_file = PROMPT_CACHE_DIR / f"schema_{key}.txt"
+        
+        try:
+            return cache_file.read_text(encoding='utf-8')
+        except OSError:
+            pass
+        
+        section = self._build_schema_section()
+        try:
+            PROMPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(section, encoding='utf-8')
+        except OSError as e:
+            logger.warning("Could not write prompt cache %s: %s", cache_file, e)
+        return section
+    
+    def _build_schema_section(self) -> str:
+        """Tables with their domain names and columns: the part of the context fixed by the schema"""
+        context_parts = [
+            "ISA-95 Manufacturing IoT Database Schema with AI-Enhanced Insights:",
+            "",
+            "=== DATABASE SCHEMA ==="
+        ]
+        
+        for table, info in self.get_database_schema().items():
+            context_parts.append(f"\nTable: {table}")
+            context_parts.append(f"Domain Names: {', '.join(info['domain_names'])}")
+            context_parts.extend(
+                f"  - {col['name']}: {col['type']}{' (Primary Key)' if col['pk'] else ''}"
+                for col in info['columns']
+            )
+        
+        return "\n".join(context_parts)
+    
+    def _build_schema_context(self, sample_data: Dict[str, List[Tuple]] = None) -> str:
+        """
+        Build the schema context shared by every LLM prompt
+        
+        Args:
+            sample_data: Optional table -> sample rows (first SAMPLE_COLUMNS columns)
+                         to show per table
+        """
+        # Get basic schema
+        schema = self.get_database_schema()
+        
+        # Get domain vocabulary
+        vocabulary = self.knowledge.get_domain_vocabulary()
+        
+        # Get schema insights
+        insights = self.knowledge.get_schema_insights()
+        
+        context_parts = [self._get_schema_section()]
+        
+        # Sample rows and learned filters change with the data, so they follow the
+        # (disk-cached) schema section rather than being part of it
+        table_parts = []
+        for table, info in schema.items():
+            details = []
             
-            # Get domain vocabulary
-            vocabulary = self.knowledge.get_domain_vocabulary()
+            # Add sample rows if requested
+            if sample_data and sample_data.get(table):
+                sample_columns = ", ".join(col['name'] for col in info['columns'][:SAMPLE_COLUMNS])
+                details.append(f"  Sample Data ({sample_columns}):")
+                details.extend(f"    Row {i}: {row}" for i, row in enumerate(sample_data[table], 1))
             
-            # Get schema insights
-            insights = self.knowledge.get_schema_insights()
+            # Add insights if available
+            if table in insights.get('common_filters', {}):
+                filters = insights['common_filters'][table]
+                if filters:
+                    details.append(f"  Common filters: {', '.join(f['description'] for f in filters[:3])}")
             
-            context_parts = [
-                "ISA-95 Manufacturing IoT Database Schema with AI-Enhanced Insights:",
+            if details:
+                table_parts.append(f"\nTable: {table}")
+                table_parts.extend(details)
+        
+        if table_parts:
+            context_parts.extend(["", "=== SAMPLE DATA AND INSIGHTS ==="])
+            context_parts.extend(table_parts)
+        
+        # Add learned domain vocabulary
+        if vocabulary:
+            context_parts.extend([
                 "",
-                "=== DATABASE SCHEMA ==="
-            ]
-            
-            for table, info in schema.items():
-                context_parts.append(f"\nTable: {table}")
-                context_parts.append(f"Domain Names: {', '.join(info['domain_names'])}")
-                
-                for col in info['columns']:
-                    col_type = f"{col['type']}"
-                    if col['pk']:
-                        col_type += " (Primary Key)"
-                    context_parts.append(f"  - {col['name']}: {col_type}")
-                
-                # Add insights if available
-                if table in insights.get('common_filters', {}):
-                    filters = insights['common_filters'][table]
-                    if filters:
-                        context_parts.append(f"  Common filters: {', '.join([f['description'] for f in filters[:3]])}")
-            
-            # Add learned domain vocabulary
-            if vocabulary:
-                context_parts.extend([
-                    "",
-                    "=== LEARNED VOCABULARY ===",
-                    ""
-                ])
-                for term, mapping in list(vocabulary.items())[:10]:  # Top 10 terms
-                    context_parts.append(f"  '{term}' → {mapping}")
-            
-            # Add ISA-95 manufacturing context
-            basic_context = "\n".join(context_parts)
-            enhanced_context = self.isa95_domain.enhance_query_context("", basic_context)
-            
-            # Add ISA-95 suggested queries
-            isa95_suggestions = self.isa95_domain.suggest_isa95_queries(schema)
-            if isa95_suggestions:
-                context_parts.extend([
-                    "",
-                    "=== ISA-95 MANUFACTURING QUERY EXAMPLES ===",
-                    ""
-                ])
-                for suggestion in isa95_suggestions[:5]:  # Top 5 suggestions
-                    context_parts.append(f"  • {suggestion}")
-            
-            self._schema_context = enhanced_context
+                "=== LEARNED VOCABULARY ===",
+                ""
+            ])
+            context_parts.extend(
+                f"  '{term}' → {mapping}"
+                for term, mapping in islice(vocabulary.items(), 10)  # Top 10 terms
+            )
         
-        return self._schema_context
+        # Add ISA-95 manufacturing context (single join of all parts)
+        return self.isa95_domain.enhance_query_context("", "\n".join(context_parts))
     
     def _is_valid_sql(self, text: str) -> bool:
         """Check if the generated text is valid SQL"""
         if not text or not isinstance(text, str):
             return False
         
-        # Basic SQL validation
-        text_upper = text.upper().strip()
-        
+        # Basic SQL validation, matched in place rather than on an uppercased copy
         # Must start with a SQL command
-        sql_commands = ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH']
-        if not any(text_upper.startswith(cmd) for cmd in sql_commands):
+        if not _SQL_START_RE.match(text):
             return False
         
         # Should not contain explanation phrases
-        explanation_phrases = [
-            'THE PROVIDED', 'I CANNOT', 'PLEASE NOTE', 'HOWEVER',
-            'UNFORTUNATELY', 'SORRY', 'WITHOUT A CLEAR'
-        ]
-        if any(phrase in text_upper for phrase in explanation_phrases):
+        if _EXPLAIN_RE.search(text):
             return False
         
         return True
@@ -680,7 +1204,7 @@ SQL Query:"""
 class ClaudeQueryInterface(EnhancedQueryInterface):
     """Legacy class name for backward compatibility"""
     def __init__(self, database_manager=None):
-        print("ℹ️  Using legacy ClaudeQueryInterface. Consider upgrading to EnhancedQueryInterface.")
+        logger.info("Using legacy ClaudeQueryInterface. Consider upgrading to EnhancedQueryInterface.")
         super().__init__(database_manager)
 
 def main():
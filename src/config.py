@@ -4,22 +4,31 @@ Configuration management for IoT Database Application
 Supports both development (SQLite) and production (Oracle) environments
 """
 
+import functools
 import os
+from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, Any
 
-class Config:
+# Snapshot of the environment taken once at import; the config classes read from it
+_ENV: Dict[str, str] = dict(os.environ)
+
+def _env(key: str, default: str = None) -> str:
+    """Look up an environment variable from the import-time snapshot"""
+    return _ENV.get(key, default)
+
+class Config(ABC):
     """Base configuration class"""
     
     # Environment detection
-    ENVIRONMENT = os.getenv('IOT_ENV', 'development').lower()
+    ENVIRONMENT = _env('IOT_ENV', 'development').lower()
     
     # Application settings
     APP_NAME = "IoT Database Query Interface"
     VERSION = "1.0.0"
     
     # Claude API settings
-    CLAUDE_API_KEY = os.getenv('ANTHROPIC_API_KEY')
+    CLAUDE_API_KEY = _env('ANTHROPIC_API_KEY')
     CLAUDE_MODEL = "claude-3-haiku-20240307"
     CLAUDE_MAX_TOKENS = 1000
     CLAUDE_TEMPERATURE = 0.1
@@ -42,6 +51,20 @@ class Config:
             return StagingConfig()
         else:
             return DevelopmentConfig()
+    
+    @functools.cached_property
+    def database_config(self) -> Dict[str, Any]:
+        """Database configuration, built and validated once per config instance"""
+        return self._build_database_config()
+    
+    def get_database_config(self) -> Dict[str, Any]:
+        """Get database configuration"""
+        return self.database_config
+    
+    @abstractmethod
+    def _build_database_config(self) -> Dict[str, Any]:
+        """Build this environment's database configuration"""
+        pass
 
 class DevelopmentConfig(Config):
     """Development environment configuration (SQLite)"""
@@ -61,7 +84,7 @@ class DevelopmentConfig(Config):
     AUTO_CREATE_DATABASE = True
     POPULATE_SAMPLE_DATA = True
     
-    def get_database_config(self) -> Dict[str, Any]:
+    def _build_database_config(self) -> Dict[str, Any]:
         """Get database configuration for development"""
         return {
             "type": self.DATABASE_TYPE,
@@ -77,15 +100,15 @@ class StagingConfig(Config):
     TESTING = False
     
     # Database settings - can be either SQLite or Oracle
-    DATABASE_TYPE = os.getenv('STAGING_DB_TYPE', 'sqlite')
+    DATABASE_TYPE = _env('STAGING_DB_TYPE', 'sqlite')
     
     # Oracle settings for staging
-    ORACLE_HOST = os.getenv('ORACLE_STAGING_HOST', 'staging-oracle.company.com')
-    ORACLE_PORT = int(os.getenv('ORACLE_STAGING_PORT', '1521'))
-    ORACLE_SERVICE = os.getenv('ORACLE_STAGING_SERVICE', 'STAGING')
-    ORACLE_USER = os.getenv('ORACLE_STAGING_USER', 'iot_staging')
-    ORACLE_PASSWORD = os.getenv('ORACLE_STAGING_PASSWORD')
-    ORACLE_SCHEMA = os.getenv('ORACLE_STAGING_SCHEMA', 'IOT_STAGING')
+    ORACLE_HOST = _env('ORACLE_STAGING_HOST', 'staging-oracle.company.com')
+    ORACLE_PORT = int(_env('ORACLE_STAGING_PORT', '1521'))
+    ORACLE_SERVICE = _env('ORACLE_STAGING_SERVICE', 'STAGING')
+    ORACLE_USER = _env('ORACLE_STAGING_USER', 'iot_staging')
+    ORACLE_PASSWORD = _env('ORACLE_STAGING_PASSWORD')
+    ORACLE_SCHEMA = _env('ORACLE_STAGING_SCHEMA', 'IOT_STAGING')
     
     # SQLite fallback
     SQLITE_DB_PATH = "iot_staging.db"
@@ -93,7 +116,7 @@ class StagingConfig(Config):
     LOG_LEVEL = "INFO"
     ENABLE_QUERY_LOGGING = True
     
-    def get_database_config(self) -> Dict[str, Any]:
+    def _build_database_config(self) -> Dict[str, Any]:
         """Get database configuration for staging"""
         if self.DATABASE_TYPE.lower() == 'oracle':
             return {
@@ -123,16 +146,16 @@ class ProductionConfig(Config):
     DATABASE_TYPE = "oracle"
     
     # Oracle connection settings
-    ORACLE_HOST = os.getenv('ORACLE_PROD_HOST')
-    ORACLE_PORT = int(os.getenv('ORACLE_PROD_PORT', '1521'))
-    ORACLE_SERVICE = os.getenv('ORACLE_PROD_SERVICE')
-    ORACLE_USER = os.getenv('ORACLE_PROD_USER')
-    ORACLE_PASSWORD = os.getenv('ORACLE_PROD_PASSWORD')
-    ORACLE_SCHEMA = os.getenv('ORACLE_PROD_SCHEMA', 'BMI_CIMS')
+    ORACLE_HOST = _env('ORACLE_PROD_HOST')
+    ORACLE_PORT = int(_env('ORACLE_PROD_PORT', '1521'))
+    ORACLE_SERVICE = _env('ORACLE_PROD_SERVICE')
+    ORACLE_USER = _env('ORACLE_PROD_USER')
+    ORACLE_PASSWORD = _env('ORACLE_PROD_PASSWORD')
+    ORACLE_SCHEMA = _env('ORACLE_PROD_SCHEMA', 'BMI_CIMS')
     
     # Production-specific settings
-    CONNECTION_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
-    CONNECTION_TIMEOUT = int(os.getenv('DB_TIMEOUT', '30'))
+    CONNECTION_POOL_SIZE = int(_env('DB_POOL_SIZE', '10'))
+    CONNECTION_TIMEOUT = int(_env('DB_TIMEOUT', '30'))
     
     LOG_LEVEL = "WARNING"
     ENABLE_QUERY_LOGGING = False
@@ -141,7 +164,7 @@ class ProductionConfig(Config):
     REQUIRE_SSL = True
     MAX_QUERY_EXECUTION_TIME = 60  # seconds
     
-    def get_database_config(self) -> Dict[str, Any]:
+    def _build_database_config(self) -> Dict[str, Any]:
         """Get database configuration for production"""
         if not all([self.ORACLE_HOST, self.ORACLE_SERVICE, self.ORACLE_USER, self.ORACLE_PASSWORD]):
             raise ValueError(
@@ -172,18 +195,18 @@ def get_config() -> Config:
 def print_config_info():
     """Print current configuration information"""
     cfg = get_config()
+    db_config = cfg.database_config
     
     print(f"Environment: {cfg.ENVIRONMENT}")
-    print(f"Database Type: {cfg.get_database_config()['type']}")
+    print(f"Database Type: {db_config['type']}")
     print(f"Debug Mode: {cfg.DEBUG}")
     print(f"Claude API Available: {'Yes' if cfg.CLAUDE_API_KEY else 'No'}")
     
     if cfg.DATABASE_TYPE == 'oracle':
-        db_config = cfg.get_database_config()
         print(f"Oracle Host: {db_config.get('host', 'Not configured')}")
         print(f"Oracle Schema: {db_config.get('schema', 'Not configured')}")
     else:
-        print(f"SQLite Path: {cfg.get_database_config()['path']}")
+        print(f"SQLite Path: {db_config['path']}")
 
 if __name__ == "__main__":
     print("IoT Database Configuration")
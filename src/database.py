@@ -4,10 +4,18 @@ Database abstraction layer for IoT Database Application
 Supports both SQLite (development) and Oracle (production) databases
 """
 
+import re
 import sqlite3
+import sys
 import logging
+import os
+import queue
+import threading
+import functools
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Iterator
 from pathlib import Path
 from .config import get_config
 
@@ -15,9 +23,63 @@ from .config import get_config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Prepared statements kept per SQLite connection (sqlite3 statement cache)
+STATEMENT_CACHE_SIZE = 256
+
+# Upper bound on worker threads for concurrent read-only queries
+MAX_QUERY_WORKERS = 8
+
+# Read-only SQLite connections kept for concurrent queries (WAL lets them read in parallel)
+SQLITE_READER_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Applied to every new SQLite connection: WAL so readers don't block the writer,
+# NORMAL sync (safe under WAL), a 64 MB page cache, in-memory temp tables and
+# reads served from a 256 MB memory map of the file instead of read() copies
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Sessions the Oracle pool keeps open when the config doesn't give a pool size
+ORACLE_POOL_MIN = 2
+
+# Schema names go into ALTER SESSION as identifiers (they can't be bound)
+_SCHEMA_NAME_RE = re.compile(r'^[A-Za-z][A-Za-z0-9_$#]*$')
+
+# Statements that can change the table list (invalidate the cached get_all_tables)
+_DDL_RE = re.compile(r'\s*(CREATE|DROP|ALTER)\b', re.IGNORECASE)
+
+# Oracle column types TO_CHAR can render; other columns (LOBs, RAW, LONG, object
+# types) are sampled as NULL since TO_CHAR rejects them or a UNION can't carry them
+_ORACLE_TO_CHAR_TYPE_RE = re.compile(
+    r'(N?VARCHAR2|N?CHAR|NUMBER|FLOAT|BINARY_FLOAT|BINARY_DOUBLE|DATE|TIMESTAMP|INTERVAL)\b',
+    re.IGNORECASE
+)
+
+# Oracle caps an IN list at 1000 expressions
+ORACLE_MAX_IN_LIST = 1000
+
+# Rows Oracle ships per network round trip (driver default is 100)
+ORACLE_FETCH_ARRAYSIZE = 1000
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _record_type(columns: Tuple[str, ...]):
+    """namedtuple class for a result column list, shared by queries with the same shape"""
+    return namedtuple("Row", columns, rename=True)
+
 class DatabaseConnection(ABC):
     """Abstract base class for database connections"""
     
+    _tables_cache: Optional[List[str]] = None  # get_all_tables result until the next DDL
+    
+    def _invalidate_on_ddl(self, sql: str):
+        """Forget the cached table list if `sql` is DDL"""
+        if _DDL_RE.match(sql):
+            self._tables_cache = None
+    
     @abstractmethod
     def connect(self) -> bool:
         """Establish database connection"""
@@ -28,6 +90,10 @@ class DatabaseConnection(ABC):
         """Close database connection"""
         pass
     
+    def close_pool(self):
+        """Close any connections kept open across connect/disconnect cycles"""
+        self.disconnect()
+    
     @abstractmethod
     def execute_query(self, sql: str, params: Optional[List] = None) -> List[Dict]:
         """Execute a query and return results"""
@@ -38,65 +104,259 @@ class DatabaseConnection(ABC):
         """Execute a non-query statement (INSERT, UPDATE, DELETE)"""
         pass
     
+    @abstractmethod
+    def execute_many(self, sql: str, seq_params: List) -> int:
+        """Execute one statement for every parameter set and commit once"""
+        pass
+    
     @abstractmethod
     def get_table_schema(self, table_name: str) -> List[Dict]:
         """Get schema information for a table"""
         pass
     
+    def get_many_table_schemas(self, tables: List[str]) -> Dict[str, List[Dict]]:
+        """Get schema information for several tables (backends may fetch them in one query)"""
+        return {table: self.get_table_schema(table) for table in tables}
+    
     @abstractmethod
     def get_all_tables(self) -> List[str]:
         """Get list of all tables"""
         pass
+    
+    @abstractmethod
+    def execute_query_tuples(self, sql: str, params: Optional[List] = None) -> List[Tuple]:
+        """Execute a query and return raw row tuples"""
+        pass
+    
+    @abstractmethod
+    def stream_query(self, sql: str, params: Optional[List] = None) -> Iterator[Dict]:
+        """Execute a query and yield row dicts one at a time"""
+        pass
+    
+    @abstractmethod
+    def execute_query_records(self, sql: str, params: Optional[List] = None) -> List[Tuple]:
+        """Execute a query and return namedtuple rows (attribute access without per-row dicts)"""
+        pass
+    
+    def execute_many_queries(self, sqls: List[str], as_tuples: bool = False) -> List[List]:
+        """Execute several queries back to back on the open cursor"""
+        execute = self.execute_query_tuples if as_tuples else self.execute_query
+        return [execute(sql) for sql in sqls]
+    
+    def execute_queries_concurrently(self, sqls: List[str]) -> List[Any]:
+        """
+        Run independent read-only queries, concurrently where the driver allows it
+        
+        Returns:
+            One entry per query: its row tuples, or the exception it raised
+        """
+        results = []
+        for sql in sqls:
+            try:
+                results.append(self.execute_query_tuples(sql))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _sample_column(self, column: str, data_type: Optional[str] = None) -> str:
+        """Select-list expression for a sample column (dialects can cast to a common type)"""
+        return column
+    
+    @abstractmethod
+    def _sample_branch_sql(self, tag: str, table: str, select_list: List[str], limit: int) -> str:
+        """One UNION ALL branch returning the tag plus up to `limit` rows of `table`"""
+        pass
+    
+    def get_sample_data_bulk(self, tables: Dict[str, List[str]], limit: int,
+                             column_types: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[Tuple]]:
+        """
+        Fetch sample rows for several tables in a single UNION ALL round trip
+        
+        Args:
+            tables: Table name -> columns to project
+            limit: Rows per table
+            column_types: Optional table name -> declared type of each of its columns,
+                          for dialects that cast sample columns by type
+        
+        Returns:
+            Table name -> list of row tuples holding the requested columns
+        """
+        if not tables:
+            return {}
+        
+        # Pad every branch with NULLs to the widest column list so the UNION lines up
+        width = max(len(columns) for columns in tables.values())
+        branches = []
+        for table, columns in tables.items():
+            types = (column_types or {}).get(table) or [None] * len(columns)
+            select_list = ([self._sample_column(col, data_type) for col, data_type in zip(columns, types)]
+                           + ['NULL'] * (width - len(columns)))
+            branches.append(self._sample_branch_sql(table.replace("'", "''"), table, select_list, limit))
+        
+        samples = {table: [] for table in tables}
+        for row in self.execute_query_tuples(" UNION ALL ".join(branches)):
+            table = row[0]
+            samples[table].append(tuple(row[1:1 + len(tables[table])]))
+        return samples
+
+class _DictRowFactory:
+    """sqlite3 row factory building dicts directly, with the key list computed once per statement"""
+    
+    __slots__ = ('_description', '_columns')
+    
+    def __init__(self):
+        self._description = None
+        self._columns = ()
+    
+    def __call__(self, cursor, row):
+        description = cursor.description
+        if description is not self._description:
+            self._columns = [sys.intern(desc[0]) for desc in description]
+            self._description = description
+        return dict(zip(self._columns, row))
 
 class SQLiteConnection(DatabaseConnection):
     """SQLite database connection for development"""
     
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        self._connected = False
+        # Per-thread connection and cursors, kept open across connect() calls; an
+        # in-memory database is therefore private to the thread that opened it
+        self._local = threading.local()
+        self._pooled = []  # Every thread's connection, so close_pool can reach them all
+        self._pool_lock = threading.Lock()
+        self._readers = queue.Queue()  # Idle reader connections for execute_queries_concurrently
+    
+    def _thread_state(self) -> threading.local:
+        """Return this thread's connection and cursors, opening them on first use"""
+        local = self._local
+        if getattr(local, 'conn', None) is None:
+            # check_same_thread=False only so close_pool can close it from another thread
+            conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(pragma)
+            local.cursor = conn.cursor()
+            local.dict_cursor = conn.cursor()  # execute_query's cursor; rows come back as dicts
+            local.dict_cursor.row_factory = _DictRowFactory()
+            local.conn = conn
+            with self._pool_lock:
+                self._pooled.append(conn)
+            logger.info(f"Connected to SQLite database: {self.db_path}")
+        return local
+    
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        """The calling thread's connection while connected"""
+        return self._thread_state().conn if self._connected else None
+    
+    @property
+    def cursor(self) -> Optional[sqlite3.Cursor]:
+        """The calling thread's cursor while connected"""
+        return self._thread_state().cursor if self._connected else None
+    
+    @property
+    def _dict_cursor(self) -> Optional[sqlite3.Cursor]:
+        return self._thread_state().dict_cursor if self._connected else None
         
     def connect(self) -> bool:
-        """Establish SQLite connection"""
+        """Establish SQLite connection (reuses this thread's pooled connection)"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row  # Enable column access by name
-            self.cursor = self.conn.cursor()
-            logger.info(f"Connected to SQLite database: {self.db_path}")
+            self._thread_state()
+            self._connected = True
             return True
         except Exception as e:
             logger.error(f"Failed to connect to SQLite: {e}")
             return False
     
     def disconnect(self):
-        """Close SQLite connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-            self.cursor = None
-            logger.info("Disconnected from SQLite database")
+        """Release the SQLite connection; each thread's stays cached for the next connect()"""
+        self._connected = False
+        self._tables_cache = None
+    
+    def close_pool(self):
+        """Close every cached per-thread connection"""
+        self.disconnect()
+        with self._pool_lock:
+            for conn in self._pooled:
+                conn.close()
+            self._pooled.clear()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        self._local = threading.local()
+        logger.info("Disconnected from SQLite database")
     
     def execute_query(self, sql: str, params: Optional[List] = None) -> List[Dict]:
         """Execute a query and return results"""
+        try:
+            if params:
+                self._dict_cursor.execute(sql, params)
+            else:
+                self._dict_cursor.execute(sql)
+            
+            # The cursor's row factory already returns dictionaries
+            return self._dict_cursor.fetchall()
+            
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            logger.error(f"SQL: {sql}")
+            if params:
+                logger.error(f"Params: {params}")
+            raise
+    
+    def execute_query_tuples(self, sql: str, params: Optional[List] = None) -> List[Tuple]:
+        """Execute a query and return raw row tuples (no per-row dict construction)"""
         try:
             if params:
                 self.cursor.execute(sql, params)
             else:
                 self.cursor.execute(sql)
             
-            # Convert sqlite3.Row objects to dictionaries
-            rows = self.cursor.fetchall()
-            return [dict(row) for row in rows]
+            return [tuple(row) for row in self.cursor.fetchall()]
             
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             logger.error(f"SQL: {sql}")
+            raise
+    
+    def stream_query(self, sql: str, params: Optional[List] = None) -> Iterator[Dict]:
+        """Yield row dicts lazily from a dedicated cursor (no full result list)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = _DictRowFactory()
+        try:
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            yield from cursor
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            logger.error(f"SQL: {sql}")
+            raise
+        finally:
+            cursor.close()
+    
+    def execute_query_records(self, sql: str, params: Optional[List] = None) -> List[Tuple]:
+        """Execute a query and return namedtuple rows"""
+        try:
             if params:
-                logger.error(f"Params: {params}")
+                self.cursor.execute(sql, params)
+            else:
+                self.cursor.execute(sql)
+            
+            Row = _record_type(tuple(desc[0] for desc in self.cursor.description))
+            return list(map(Row._make, self.cursor.fetchall()))
+            
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            logger.error(f"SQL: {sql}")
             raise
     
     def execute_non_query(self, sql: str, params: Optional[List] = None) -> int:
         """Execute a non-query statement"""
+        self._invalidate_on_ddl(sql)
         try:
             if params:
                 self.cursor.execute(sql, params)
@@ -111,6 +371,19 @@ class SQLiteConnection(DatabaseConnection):
             logger.error(f"Non-query execution failed: {e}")
             raise
     
+    def execute_many(self, sql: str, seq_params: List) -> int:
+        """Bind the statement once for all parameter sets inside a single transaction"""
+        self._invalidate_on_ddl(sql)
+        try:
+            with self.conn:
+                self.cursor.executemany(sql, seq_params)
+            return self.cursor.rowcount
+            
+        except Exception as e:
+            logger.error(f"Batch execution failed: {e}")
+            logger.error(f"SQL: {sql}")
+            raise
+    
     def get_table_schema(self, table_name: str) -> List[Dict]:
         """Get schema information for a table"""
         try:
@@ -121,71 +394,181 @@ class SQLiteConnection(DatabaseConnection):
             logger.error(f"Failed to get schema for table {table_name}: {e}")
             return []
     
+    def execute_queries_concurrently(self, sqls: List[str]) -> List[Any]:
+        """Run read-only queries on a thread pool, each borrowing a pooled reader connection"""
+        if self.db_path == ':memory:' or len(sqls) < 2:
+            # Other connections can't see an in-memory database
+            return super().execute_queries_concurrently(sqls)
+        
+        def run(sql):
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE,
+                                       check_same_thread=False)
+            try:
+                return conn.execute(sql).fetchall()
+            except Exception as e:
+                logger.error(f"Query execution failed: {e}")
+                logger.error(f"SQL: {sql}")
+                return e
+            finally:
+                # Keep up to the pool size for the next batch; close any overflow
+                if self._readers.qsize() < SQLITE_READER_POOL_SIZE:
+                    self._readers.put(conn)
+                else:
+                    conn.close()
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_QUERY_WORKERS, SQLITE_READER_POOL_SIZE, len(sqls))) as executor:
+            return list(executor.map(run, sqls))
+    
+    def _sample_branch_sql(self, tag: str, table: str, select_list: List[str], limit: int) -> str:
+        """SQLite only allows LIMIT on a compound member inside a subquery"""
+        return f"SELECT * FROM (SELECT '{tag}', {', '.join(select_list)} FROM {table} LIMIT {limit})"
+    
     def get_all_tables(self) -> List[str]:
         """Get list of all tables"""
+        if self._tables_cache is not None:
+            return list(self._tables_cache)
         try:
             self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = self.cursor.fetchall()
-            return [table['name'] for table in tables if table['name'] != 'sqlite_sequence']
+            self._tables_cache = [table['name'] for table in tables if table['name'] != 'sqlite_sequence']
+            return list(self._tables_cache)
         except Exception as e:
             logger.error(f"Failed to get table list: {e}")
             return []
 
+def _set_current_schema(conn, schema: str):
+    """Point the session at `schema` (validated, since identifiers can't be bind variables)"""
+    if not _SCHEMA_NAME_RE.match(schema):
+        raise ValueError(f"Invalid Oracle schema name: {schema!r}")
+    with conn.cursor() as cursor:
+        cursor.execute(f"ALTER SESSION SET CURRENT_SCHEMA = {schema}")
+
+def _init_pooled_session(conn, requested_tag: str):
+    """oracledb session callback: set the schema only on sessions not already tagged with it"""
+    if requested_tag and conn.tag != requested_tag:
+        _set_current_schema(conn, requested_tag)
+        conn.tag = requested_tag
+
+@functools.lru_cache(maxsize=1)
+def _oracle_driver():
+    """Import the Oracle driver on first use (oracledb, else cx_Oracle); None if neither is installed"""
+    try:
+        import oracledb
+        logger.info("Oracle driver (oracledb) available")
+        return oracledb
+    except ImportError:
+        pass
+    try:
+        import cx_Oracle
+        logger.info("Oracle driver (cx_Oracle) available")
+        return cx_Oracle
+    except ImportError:
+        logger.error("No Oracle driver available. Install: pip install oracledb")
+        return None
+
 class OracleConnection(DatabaseConnection):
     """Oracle database connection for production"""
     
+    # Dictionary queries; fixed text so each is parsed once and reused via _prepared_cursor
+    _SCHEMA_SQL = """
+        SELECT 
+            column_name,
+            data_type,
+            data_length,
+            data_precision,
+            data_scale,
+            nullable,
+            column_id
+        FROM all_tab_columns 
+        WHERE owner = :schema AND table_name = :table_name
+        ORDER BY column_id
+    """
+    _TABLES_SQL = """
+        SELECT table_name 
+        FROM all_tables 
+        WHERE owner = :schema
+        ORDER BY table_name
+    """
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.conn = None
-        self.cursor = None
-        self._oracle_available = False
+        self._connected = False
+        # Per-thread session, cursor and prepared metadata cursors: the manager is shared
+        # process-wide and Oracle cursors must not be used from two threads at once
+        self._local = threading.local()
+        self._sessions = []  # Every thread's session, so disconnect can release them all
+        self._sessions_lock = threading.Lock()
+        self._pool = None  # oracledb session pool, created on first connect
+    
+    def _open_session(self):
+        """Acquire a pooled session (oracledb) or open a direct connection (cx_Oracle)"""
+        driver = _oracle_driver()
+        schema = self.config.get('schema')
+        if self._pool is not None:
+            # Sessions are tagged with their schema, so a reused one skips ALTER SESSION
+            return self._pool.acquire(tag=schema) if schema else self._pool.acquire()
         
-        # Try to import Oracle driver
-        try:
-            import oracledb
-            self.oracledb = oracledb
-            self._oracle_available = True
-            logger.info("Oracle driver (oracledb) available")
-        except ImportError:
-            try:
-                import cx_Oracle
-                self.cx_Oracle = cx_Oracle
-                self._oracle_available = True
-                logger.info("Oracle driver (cx_Oracle) available")
-            except ImportError:
-                logger.error("No Oracle driver available. Install: pip install oracledb")
-                self._oracle_available = False
+        # Using legacy cx_Oracle driver
+        dsn = f"{self.config['host']}:{self.config['port']}/{self.config['service']}"
+        conn = driver.connect(
+            user=self.config['user'],
+            password=self.config['password'],
+            dsn=dsn
+        )
+        # Set current schema if specified
+        if schema:
+            _set_current_schema(conn, schema)
+        return conn
+    
+    def _thread_state(self) -> threading.local:
+        """Return this thread's session and cursors, acquiring them on first use"""
+        local = self._local
+        if getattr(local, 'conn', None) is None:
+            conn = self._open_session()
+            local.cursor = conn.cursor()
+            self._tune_fetch(local.cursor)
+            local.stmt_cache = {}  # Fixed metadata SQL text -> cursor holding its parsed statement
+            local.conn = conn
+            with self._sessions_lock:
+                self._sessions.append(local.__dict__)
+        return local
+    
+    @property
+    def conn(self):
+        """The calling thread's session while connected"""
+        return self._thread_state().conn if self._connected else None
+    
+    @property
+    def cursor(self):
+        """The calling thread's cursor while connected"""
+        return self._thread_state().cursor if self._connected else None
     
     def connect(self) -> bool:
         """Establish Oracle connection"""
-        if not self._oracle_available:
+        driver = _oracle_driver()
+        if driver is None:
             logger.error("Oracle driver not available")
             return False
         
         try:
-            # Build connection string
-            dsn = f"{self.config['host']}:{self.config['port']}/{self.config['service']}"
-            
-            if hasattr(self, 'oracledb'):
-                # Using modern oracledb driver
-                self.conn = self.oracledb.connect(
+            if driver.__name__ == 'oracledb' and self._pool is None:
+                # Using modern oracledb driver: every thread's session comes from one pool
+                pool_min = ORACLE_POOL_MIN
+                self._pool = driver.create_pool(
                     user=self.config['user'],
                     password=self.config['password'],
-                    dsn=dsn
+                    dsn=f"{self.config['host']}:{self.config['port']}/{self.config['service']}",
+                    min=pool_min,
+                    max=max(pool_min, self.config.get('pool_size', pool_min)),
+                    increment=1,
+                    session_callback=_init_pooled_session
                 )
-            else:
-                # Using legacy cx_Oracle driver
-                self.conn = self.cx_Oracle.connect(
-                    user=self.config['user'],
-                    password=self.config['password'],
-                    dsn=dsn
-                )
-            
-            self.cursor = self.conn.cursor()
             
-            # Set current schema if specified
-            if 'schema' in self.config and self.config['schema']:
-                self.cursor.execute(f"ALTER SESSION SET CURRENT_SCHEMA = {self.config['schema']}")
+            self._thread_state()
+            self._connected = True
             
             logger.info(f"Connected to Oracle database: {self.config['host']}")
             return True
@@ -194,30 +577,74 @@ class OracleConnection(DatabaseConnection):
             logger.error(f"Failed to connect to Oracle: {e}")
             return False
     
+    @staticmethod
+    def _tune_fetch(cursor):
+        """Fetch rows in large batches to cut round trips on big result sets"""
+        cursor.arraysize = ORACLE_FETCH_ARRAYSIZE
+        cursor.prefetchrows = ORACLE_FETCH_ARRAYSIZE
+    
+    def _prepared_cursor(self, sql: str):
+        """
+        Return a cursor dedicated to this SQL text so Oracle can skip re-parsing it
+        
+        Only for the class's fixed metadata statements: each one holds an open cursor
+        for the session's lifetime. Ad-hoc SQL runs on self.cursor and relies on the
+        driver's statement cache instead.
+        """
+        state = self._thread_state()
+        cursor = state.stmt_cache.get(sql)
+        if cursor is None:
+            cursor = state.conn.cursor()
+            self._tune_fetch(cursor)
+            cursor.prepare(sql)
+            state.stmt_cache[sql] = cursor
+        return cursor
+    
     def disconnect(self):
-        """Close Oracle connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
-        self.conn = None
-        self.cursor = None
+        """Close every thread's cursors and release its session"""
+        self._connected = False
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+            # Threads acquire a fresh session on their next use after a reconnect
+            self._local = threading.local()
+        for session in sessions:
+            for cursor in session['stmt_cache'].values():
+                cursor.close()
+            session['cursor'].close()
+            if self._pool is not None:
+                self._pool.release(session['conn'])
+            else:
+                session['conn'].close()
+        self._tables_cache = None
         logger.info("Disconnected from Oracle database")
     
+    def close_pool(self):
+        """Release every session and shut down the session pool"""
+        self.disconnect()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+    
     def execute_query(self, sql: str, params: Optional[List] = None) -> List[Dict]:
         """Execute a query and return results"""
         try:
+            cursor = self.cursor
             if params:
-                self.cursor.execute(sql, params)
+                cursor.execute(sql, params)
             else:
-                self.cursor.execute(sql)
+                cursor.execute(sql)
             
-            # Get column names
-            columns = [desc[0] for desc in self.cursor.description]
+            # Get column names (interned once; every row dict reuses them)
+            columns = [sys.intern(desc[0]) for desc in cursor.description]
             
-            # Fetch results and convert to dictionaries
-            rows = self.cursor.fetchall()
-            return [dict(zip(columns, row)) for row in rows]
+            # Fetch results in arraysize batches and convert to dictionaries
+            results = []
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                results.extend(dict(zip(columns, row)) for row in rows)
+            return results
             
         except Exception as e:
             logger.error(f"Oracle query execution failed: {e}")
@@ -226,8 +653,61 @@ class OracleConnection(DatabaseConnection):
                 logger.error(f"Params: {params}")
             raise
     
+    def execute_query_tuples(self, sql: str, params: Optional[List] = None) -> List[Tuple]:
+        """Execute a query and return raw row tuples"""
+        try:
+            cursor = self.cursor
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            
+            return cursor.fetchall()
+            
+        except Exception as e:
+            logger.error(f"Oracle query execution failed: {e}")
+            logger.error(f"SQL: {sql}")
+            raise
+    
+    def stream_query(self, sql: str, params: Optional[List] = None) -> Iterator[Dict]:
+        """Yield row dicts lazily; rows still arrive from Oracle in arraysize batches"""
+        cursor = self.conn.cursor()
+        self._tune_fetch(cursor)
+        try:
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            columns = [sys.intern(desc[0]) for desc in cursor.description]
+            for row in cursor:
+                yield dict(zip(columns, row))
+        except Exception as e:
+            logger.error(f"Oracle query execution failed: {e}")
+            logger.error(f"SQL: {sql}")
+            raise
+        finally:
+            cursor.close()
+    
+    def execute_query_records(self, sql: str, params: Optional[List] = None) -> List[Tuple]:
+        """Execute a query and return namedtuple rows"""
+        try:
+            cursor = self.cursor
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            
+            Row = _record_type(tuple(desc[0] for desc in cursor.description))
+            return list(map(Row._make, cursor.fetchall()))
+            
+        except Exception as e:
+            logger.error(f"Oracle query execution failed: {e}")
+            logger.error(f"SQL: {sql}")
+            raise
+    
     def execute_non_query(self, sql: str, params: Optional[List] = None) -> int:
         """Execute a non-query statement"""
+        self._invalidate_on_ddl(sql)
         try:
             if params:
                 self.cursor.execute(sql, params)
@@ -242,62 +722,116 @@ class OracleConnection(DatabaseConnection):
             logger.error(f"Oracle non-query execution failed: {e}")
             raise
     
+    def execute_many(self, sql: str, seq_params: List) -> int:
+        """Send all parameter sets in one array-bound round trip and commit once"""
+        self._invalidate_on_ddl(sql)
+        try:
+            self.cursor.executemany(sql, seq_params)
+            self.conn.commit()
+            return self.cursor.rowcount
+            
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Oracle batch execution failed: {e}")
+            logger.error(f"SQL: {sql}")
+            raise
+    
     def get_table_schema(self, table_name: str) -> List[Dict]:
         """Get schema information for a table"""
         try:
             schema = self.config.get('schema', 'BMI_CIMS')
-            sql = """
-                SELECT 
-                    column_name,
-                    data_type,
-                    data_length,
-                    data_precision,
-                    data_scale,
-                    nullable,
-                    column_id
-                FROM all_tab_columns 
-                WHERE owner = :schema AND table_name = :table_name
-                ORDER BY column_id
-            """
-            self.cursor.execute(sql, [schema, table_name.upper()])
-            columns = self.cursor.fetchall()
+            cursor = self._prepared_cursor(self._SCHEMA_SQL)
+            cursor.execute(None, {'schema': schema, 'table_name': table_name.upper()})
+            columns = cursor.fetchall()
             
-            column_names = [desc[0].lower() for desc in self.cursor.description]
+            column_names = [desc[0].lower() for desc in cursor.description]
             return [dict(zip(column_names, col)) for col in columns]
             
         except Exception as e:
             logger.error(f"Failed to get Oracle schema for table {table_name}: {e}")
             return []
     
+    def get_many_table_schemas(self, tables: List[str]) -> Dict[str, List[Dict]]:
+        """Get schema information for several tables with one all_tab_columns query per 1000 tables"""
+        schemas = {table: [] for table in tables}
+        by_upper = {table.upper(): table for table in tables}
+        names = list(by_upper)
+        schema = self.config.get('schema', 'BMI_CIMS')
+        try:
+            for start in range(0, len(names), ORACLE_MAX_IN_LIST):
+                chunk = names[start:start + ORACLE_MAX_IN_LIST]
+                binds = {f"t{i}": name for i, name in enumerate(chunk)}
+                in_list = ", ".join(f":{bind}" for bind in binds)
+                sql = f"""
+                    SELECT 
+                        table_name,
+                        column_name,
+                        data_type,
+                        data_length,
+                        data_precision,
+                        data_scale,
+                        nullable,
+                        column_id
+                    FROM all_tab_columns 
+                    WHERE owner = :schema AND table_name IN ({in_list})
+                    ORDER BY table_name, column_id
+                """
+                self.cursor.execute(sql, {'schema': schema, **binds})
+                column_names = [desc[0].lower() for desc in self.cursor.description[1:]]
+                for row in self.cursor.fetchall():
+                    schemas[by_upper[row[0]]].append(dict(zip(column_names, row[1:])))
+            return schemas
+            
+        except Exception as e:
+            logger.error(f"Failed to get Oracle schemas for tables {names}: {e}")
+            return {table: [] for table in tables}
+    
     def get_all_tables(self) -> List[str]:
         """Get list of all tables"""
+        if self._tables_cache is not None:
+            return list(self._tables_cache)
         try:
             schema = self.config.get('schema', 'BMI_CIMS')
-            sql = """
-                SELECT table_name 
-                FROM all_tables 
-                WHERE owner = :schema
-                ORDER BY table_name
-            """
-            self.cursor.execute(sql, [schema])
-            tables = self.cursor.fetchall()
-            return [table[0] for table in tables]
+            cursor = self._prepared_cursor(self._TABLES_SQL)
+            cursor.execute(None, {'schema': schema})
+            tables = cursor.fetchall()
+            self._tables_cache = [table[0] for table in tables]
+            return list(self._tables_cache)
             
         except Exception as e:
             logger.error(f"Failed to get Oracle table list: {e}")
             return []
+    
+    def _sample_column(self, column: str, data_type: Optional[str] = None) -> str:
+        """Cast to text so UNION ALL branches agree on column types; NULL where TO_CHAR can't"""
+        if data_type is not None and not _ORACLE_TO_CHAR_TYPE_RE.match(data_type):
+            return "NULL"
+        return f"TO_CHAR({column})"
+    
+    def _sample_branch_sql(self, tag: str, table: str, select_list: List[str], limit: int) -> str:
+        return f"SELECT '{tag}', {', '.join(select_list)} FROM {table} WHERE ROWNUM <= {limit}"
 
 class DatabaseManager:
     """Database manager that handles connection based on configuration"""
     
+    # Backend methods bound straight onto the manager (no wrapper frame per call)
+    _DELEGATED_METHODS = (
+        'execute_query', 'execute_query_tuples', 'execute_query_records', 'stream_query',
+        'execute_many_queries', 'get_sample_data_bulk', 'execute_queries_concurrently',
+        'execute_non_query', 'execute_many', 'get_table_schema', 'get_many_table_schemas',
+        'get_all_tables',
+    )
+    
     def __init__(self):
         self.config = get_config()
         self.connection = None
+        self._users = 0  # Open connect() calls; the manager is shared by every caller
+        self._lock = threading.Lock()
         self._setup_connection()
     
     def _setup_connection(self):
         """Setup database connection based on configuration"""
-        db_config = self.config.get_database_config()
+        db_config = self._db_config = self.config.database_config
         
         if db_config['type'] == 'sqlite':
             self.connection = SQLiteConnection(db_config['path'])
@@ -305,35 +839,38 @@ class DatabaseManager:
             self.connection = OracleConnection(db_config)
         else:
             raise ValueError(f"Unsupported database type: {db_config['type']}")
+        
+        for name in self._DELEGATED_METHODS:
+            setattr(self, name, getattr(self.connection, name))
     
     def connect(self) -> bool:
-        """Connect to database"""
-        return self.connection.connect()
+        """Connect to database (no-op if another user already holds the connection)"""
+        with self._lock:
+            if self._users and self.is_connected():
+                self._users += 1
+                return True
+            if not self.connection.connect():
+                return False
+            self._users += 1
+            return True
     
     def disconnect(self):
-        """Disconnect from database"""
-        if self.connection:
-            self.connection.disconnect()
-    
-    def execute_query(self, sql: str, params: Optional[List] = None) -> List[Dict]:
-        """Execute a query and return results"""
-        return self.connection.execute_query(sql, params)
-    
-    def execute_non_query(self, sql: str, params: Optional[List] = None) -> int:
-        """Execute a non-query statement"""
-        return self.connection.execute_non_query(sql, params)
-    
-    def get_table_schema(self, table_name: str) -> List[Dict]:
-        """Get schema information for a table"""
-        return self.connection.get_table_schema(table_name)
-    
-    def get_all_tables(self) -> List[str]:
-        """Get list of all tables"""
-        return self.connection.get_all_tables()
+        """Disconnect from database once the last user lets go"""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0 and self.connection:
+                self.connection.disconnect()
+    
+    def close(self):
+        """Disconnect every user and close pooled connections"""
+        with self._lock:
+            self._users = 0
+            if self.connection:
+                self.connection.close_pool()
     
     def get_database_type(self) -> str:
         """Get the current database type"""
-        return self.config.get_database_config()['type']
+        return self._db_config['type']
     
     def is_connected(self) -> bool:
         """Check if database is connected"""
@@ -348,8 +885,9 @@ class DatabaseManager:
         """Context manager exit"""
         self.disconnect()
 
+@functools.lru_cache(maxsize=1)
 def get_database_manager() -> DatabaseManager:
-    """Get a database manager instance"""
+    """Get the shared database manager instance"""
     return DatabaseManager()
 
 if __name__ == "__main__":
@@ -5,11 +5,46 @@ Maps business/domain terminology to actual database table names
 Loads mappings from JSON configuration files
 """
 
+import copy
+import functools
 import json
 import os
+import re
+from collections import namedtuple
 from pathlib import Path
+from types import MappingProxyType
+
+# orjson parses the mapping file and serializes the mapping blob faster;
+# the stdlib codec is the fallback (orjson's decode error subclasses json's)
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# pyahocorasick scans prompt text for every domain term in one pass; without it
+# scan() falls back to a single longest-first regex alternation
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+@functools.lru_cache(maxsize=8)
+def _load_raw(path: str, mtime: float) -> dict:
+    """Parsed mapping file, shared by every mapper until the file's mtime changes"""
+    return _json_loads(Path(path).read_bytes())
+
+# Domain term -> table mappings plus the lookup indexes derived from them
+_TableIndex = namedtuple("_TableIndex", "mappings term_rank multi_word_items reverse unique_tables")
 
 class DomainMapper:
+    # Fixed attribute layout: no per-instance __dict__ for every mapper a worker spawns
+    __slots__ = ("config_path", "_raw", "_tables", "_columns", "_terms", "_descriptions",
+                 "_mappings_json", "_scanner", "_term_automaton", "_all_mappings")
+    
     def __init__(self, config_path: str = None):
         """
         Initialize domain mapper with mappings loaded from JSON files
@@ -34,46 +69,103 @@ class DomainMapper:
         self._load_mappings()
     
     def _load_mappings(self):
-        """Load all mappings from JSON configuration files"""
+        """Load the mapping file; each section is built from it on first access"""
         try:
             # Load comprehensive mappings
             mappings_file = self.config_path / "table_domain_mappings.json"
-            with open(mappings_file, 'r') as f:
-                data = json.load(f)
-            
-            # Extract table mappings from reverse_mappings section
-            self.table_mappings = data.get("reverse_mappings", {})
-            
-            # Extract column mappings from tables section
-            self.column_mappings = {}
-            for table_name, table_info in data.get("tables", {}).items():
-                if "column_mappings" in table_info:
-                    self.column_mappings[table_name] = table_info["column_mappings"]
-            
-            # Extract business terms
-            business_terms_data = data.get("business_terms", {})
-            self.business_terms = business_terms_data.get("terms", {})
-            
-            # Store table descriptions for reference
-            self.table_descriptions = {}
-            for table_name, table_info in data.get("tables", {}).items():
-                self.table_descriptions[table_name] = {
-                    "description": table_info.get("description", ""),
-                    "purpose": table_info.get("purpose", ""),
-                    "domain_names": table_info.get("domain_names", [])
-                }
-        
+            # The parsed data is shared by every mapper, so the sections deep-copy any
+            # nested values they expose rather than handing out the cached objects
+            self._raw = _load_raw(str(mappings_file), mappings_file.stat().st_mtime)
         except FileNotFoundError as e:
             raise FileNotFoundError(f"Required mapping file not found: {e}. Please ensure table_domain_mappings.json exists in {self.config_path}")
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in mapping file: {e}")
         except Exception as e:
             raise RuntimeError(f"Error loading mappings: {e}")
+        
+        # Sections, serialized forms and matchers are (re)built on first use
+        self._tables = None
+        self._columns = None
+        self._terms = None
+        self._descriptions = None
+        self._mappings_json = None
+        self._scanner = None  # Term automaton/regex, built on first scan call
+        self._term_automaton = None  # Business terms only, built on first scan_business_terms call
+        self._all_mappings = None
+    
+    def _table_index(self) -> _TableIndex:
+        """Build the table mappings and their indexes on first use"""
+        if self._tables is None:
+            # Extract table mappings from reverse_mappings section (keys lower-cased
+            # once here so lookups only need to fold the incoming term)
+            mappings = {term.lower(): table for term, table in self._raw.get("reverse_mappings", {}).items()}
+            # Single-word domain term -> position in the mappings (earlier terms win
+            # entity matches); multi-word terms need a substring search instead.
+            # The same pass builds the inverted index: table name -> domain terms
+            term_rank = {}
+            multi_word_items = []
+            reverse = {}
+            for i, (term, table) in enumerate(mappings.items()):
+                if term.replace('_', '').isalnum():
+                    term_rank[term] = i
+                else:
+                    multi_word_items.append((term, table))
+                reverse.setdefault(table, []).append(term)
+            self._tables = _TableIndex(MappingProxyType(mappings), term_rank, multi_word_items,
+                                       reverse, frozenset(reverse))
+        return self._tables
+    
+    @property
+    def table_mappings(self) -> MappingProxyType:
+        """Domain term (lower-case) -> table name"""
+        return self._table_index().mappings
+    
+    @property
+    def column_mappings(self) -> MappingProxyType:
+        """Table name -> column name -> domain aliases"""
+        if self._columns is None:
+            self._columns = MappingProxyType({
+                table_name: copy.deepcopy(table_info["column_mappings"])
+                for table_name, table_info in self._raw.get("tables", {}).items()
+                if "column_mappings" in table_info
+            })
+        return self._columns
+    
+    @property
+    def business_terms(self) -> MappingProxyType:
+        """Business term (lower-case) -> technical terms"""
+        if self._terms is None:
+            business_terms_data = self._raw.get("business_terms", {})
+            self._terms = MappingProxyType(
+                {term.lower(): copy.deepcopy(resolved) for term, resolved in business_terms_data.get("terms", {}).items()})
+        return self._terms
+    
+    @property
+    def table_descriptions(self) -> MappingProxyType:
+        """Table name -> description, purpose and domain names"""
+        if self._descriptions is None:
+            self._descriptions = MappingProxyType({
+                table_name: {
+                    "description": table_info.get("description", ""),
+                    "purpose": table_info.get("purpose", ""),
+                    "domain_names": list(table_info.get("domain_names", []))
+                }
+                for table_name, table_info in self._raw.get("tables", {}).items()
+            })
+        return self._descriptions
     
     
     def get_table_name(self, domain_term: str) -> str:
         """Convert domain term to actual table name"""
-        return self.table_mappings.get(domain_term.lower(), domain_term)
+        table = self.table_mappings.get(domain_term)
+        if table is None:
+            # Only fold case when the term isn't already a lower-case key
+            table = self.table_mappings.get(domain_term.lower(), domain_term)
+        return table
+    
+    def get_table_name_lc(self, domain_term: str) -> str:
+        """get_table_name for a term the caller has already lower-cased (single dict hit)"""
+        return self.table_mappings.get(domain_term, domain_term)
     
     def get_column_aliases(self, table_name: str, column_name: str) -> list:
         """Get possible domain names for a database column"""
@@ -83,7 +175,10 @@ class DomainMapper:
     
     def resolve_business_term(self, term: str) -> list:
         """Resolve business terminology to technical terms"""
-        return self.business_terms.get(term.lower(), [term])
+        resolved = self.business_terms.get(term)
+        if resolved is None:
+            resolved = self.business_terms.get(term.lower(), [term])
+        return resolved
     
     def get_table_description(self, table_name: str) -> dict:
         """Get description and metadata for a table"""
@@ -93,18 +188,90 @@ class DomainMapper:
             "domain_names": []
         })
     
-    def get_all_mappings(self) -> dict:
-        """Return all mappings for reference"""
-        return {
-            "table_mappings": self.table_mappings,
-            "column_mappings": self.column_mappings,
-            "business_terms": self.business_terms,
-            "table_descriptions": self.table_descriptions
-        }
+    def get_all_mappings(self) -> MappingProxyType:
+        """Return a read-only view of all mappings for reference"""
+        if self._all_mappings is None:
+            self._all_mappings = MappingProxyType({
+                "table_mappings": self.table_mappings,
+                "column_mappings": self.column_mappings,
+                "business_terms": self.business_terms,
+                "table_descriptions": self.table_descriptions
+            })
+        return self._all_mappings
+    
+    def get_mappings_json(self) -> str:
+        """Table, column and business-term mappings as JSON (serialized once per load)"""
+        if self._mappings_json is None:
+            # Neither codec serializes mappingproxy, so hand them plain dict copies
+            self._mappings_json = _json_dumps({
+                "table_mappings": dict(self.table_mappings),
+                "column_mappings": dict(self.column_mappings),
+                "business_terms": dict(self.business_terms)
+            })
+        return self._mappings_json
+    
+    @staticmethod
+    def _build_scanner(terms):
+        """Compile the terms (term -> value) into one multi-pattern matcher"""
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for term, value in terms.items():
+                automaton.add_word(term, (term, value))
+            automaton.make_automaton()
+            return automaton
+        alternation = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+        return re.compile(alternation), terms
+    
+    def scan(self, text: str) -> list:
+        """
+        Find domain terms in text with a single pass
+        
+        Returns:
+            (start, end, term, value) for each leftmost-longest, non-overlapping match,
+            where value is the table name or the business term's synonyms
+        """
+        if self._scanner is None:
+            # Table mappings win when a term is in both
+            self._scanner = self._build_scanner({**self.business_terms, **self.table_mappings})
+        return self._run_scanner(self._scanner, text)
+    
+    def scan_business_terms(self, text: str) -> list:
+        """
+        Find business terms in free text with a single pass
+        
+        Returns:
+            (start, end, term) for each leftmost-longest, non-overlapping match;
+            resolve_business_term gives the synonyms for a term
+        """
+        if self._term_automaton is None:
+            self._term_automaton = self._build_scanner(self.business_terms)
+        return [match[:3] for match in self._run_scanner(self._term_automaton, text)]
+    
+    @staticmethod
+    def _run_scanner(scanner, text: str) -> list:
+        """(start, end, term, value) matches of a _build_scanner matcher over text"""
+        text = text.lower()
+        if ahocorasick is not None:
+            return [(end - len(term) + 1, end + 1, term, value)
+                    for end, (term, value) in scanner.iter_long(text)]
+        pattern, terms = scanner
+        return [(m.start(), m.end(), m.group(), terms[m.group()]) for m in pattern.finditer(text)]
+    
+    def term_rank(self) -> dict:
+        """Single-word domain term -> its position in the mappings (lower ranks win entity matches)"""
+        return self._table_index().term_rank
+    
+    def multi_word_terms(self) -> list:
+        """(term, table) pairs for domain terms that can't match a single word"""
+        return self._table_index().multi_word_items
+    
+    def get_mapped_tables(self) -> frozenset:
+        """Distinct table names that at least one domain term maps to"""
+        return self._table_index().unique_tables
     
     def reverse_lookup_table(self, table_name: str) -> list:
         """Find all domain terms that map to a specific table"""
-        return [domain for domain, table in self.table_mappings.items() if table == table_name]
+        return list(self._table_index().reverse.get(table_name, []))
     
     def reload_mappings(self):
         """Reload mappings from JSON files (useful for runtime updates)"""
@@ -131,8 +298,7 @@ def main():
     
     print("\nTable Descriptions:")
     print("-" * 40)
-    unique_tables = set(mapper.table_mappings.values())
-    for table in sorted(unique_tables):
+    for table in sorted(mapper.get_mapped_tables()):
         desc = mapper.get_table_description(table)
         print(f"{table}:")
         print(f"  Description: {desc['description']}")
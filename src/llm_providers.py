@@ -9,7 +9,6 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-import anthropic
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -69,8 +68,13 @@ class ClaudeProvider(LLMProvider):
             logger.warning("Claude provider: No API key found")
         else:
             try:
+                import anthropic
                 self.client = anthropic.Anthropic(api_key=self.api_key)
                 logger.info("✓ Claude provider initialized successfully")
+            except ImportError:
+                self.is_available = False
+                self.last_error = "anthropic package not installed"
+                logger.error("Claude provider: anthropic package not installed")
             except Exception as e:
                 self.is_available = False
                 self.last_error = str(e)
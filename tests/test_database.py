@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite database layer against a temporary database
+"""
+
+from itertools import islice
+
+import pytest
+
+from src.database import OracleConnection, SQLiteConnection
+
+@pytest.fixture
+def db(tmp_path):
+    """Connected SQLiteConnection with small DevMap and RepData tables"""
+    conn = SQLiteConnection(str(tmp_path / "test.db"))
+    assert conn.connect()
+    conn.execute_non_query(
+        "CREATE TABLE DevMap (device_id TEXT PRIMARY KEY, device_name TEXT, status TEXT)")
+    conn.execute_non_query(
+        "CREATE TABLE RepData (id INTEGER PRIMARY KEY, device_id TEXT, value REAL)")
+    yield conn
+    conn.close_pool()
+
+def test_execute_many_returns_rows_affected(db):
+    devices = [(f"DEV{i:03d}", f"Device {i}", "online") for i in range(5)]
+    assert db.execute_many("INSERT INTO DevMap VALUES (?, ?, ?)", devices) == 5
+
+    # Each parameter set's changes are summed
+    updated = db.execute_many("UPDATE DevMap SET status = ? WHERE device_id <= ?",
+                              [("offline", "DEV001"), ("maintenance", "DEV000")])
+    assert updated == 3
+    assert db.execute_query_tuples("SELECT COUNT(*) FROM DevMap")[0][0] == 5
+
+def test_execute_many_rolls_back_the_whole_batch(db):
+    devices = [("DEV001", "Device 1", "online"), ("DEV001", "Duplicate", "online")]
+    with pytest.raises(Exception):
+        db.execute_many("INSERT INTO DevMap VALUES (?, ?, ?)", devices)
+    assert db.execute_query_tuples("SELECT COUNT(*) FROM DevMap")[0][0] == 0
+
+def test_ddl_invalidates_table_cache(db):
+    assert sorted(db.get_all_tables()) == ["DevMap", "RepData"]
+
+    db.execute_many("CREATE TABLE AlertLog (id INTEGER PRIMARY KEY)", [()])
+    assert sorted(db.get_all_tables()) == ["AlertLog", "DevMap", "RepData"]
+
+    db.execute_non_query("DROP TABLE AlertLog")
+    assert sorted(db.get_all_tables()) == ["DevMap", "RepData"]
+
+def test_dml_keeps_table_cache(db):
+    db.get_all_tables()
+    db.execute_many("INSERT INTO RepData (device_id, value) VALUES (?, ?)", [("DEV001", 1.0)])
+    assert sorted(db._tables_cache) == ["DevMap", "RepData"]
+
+def test_stream_query_yields_rows_in_chunks(db):
+    db.execute_many("INSERT INTO RepData (device_id, value) VALUES (?, ?)",
+                    [(f"DEV{i % 3:03d}", float(i)) for i in range(250)])
+
+    rows = db.stream_query("SELECT id, value FROM RepData WHERE value >= ? ORDER BY id", [50.0])
+    first = list(islice(rows, 100))
+    # The stream has its own cursor, so other queries can run between chunks
+    assert db.execute_query("SELECT COUNT(*) AS n FROM RepData") == [{"n": 250}]
+    rest = list(rows)
+
+    assert len(first) == 100 and len(rest) == 100
+    assert first[0] == {"id": 51, "value": 50.0}
+    assert [row["id"] for row in first + rest] == list(range(51, 251))
+
+def test_stream_query_closed_early(db):
+    db.execute_many("INSERT INTO RepData (device_id, value) VALUES (?, ?)",
+                    [("DEV001", float(i)) for i in range(10)])
+    rows = db.stream_query("SELECT value FROM RepData")
+    assert next(rows) == {"value": 0.0}
+    rows.close()
+    assert db.execute_query_tuples("SELECT COUNT(*) FROM RepData")[0][0] == 10
+
+def test_sample_data_bulk_pads_narrow_tables(db):
+    db.execute_many("INSERT INTO DevMap VALUES (?, ?, ?)",
+                    [(f"DEV{i:03d}", f"Device {i}", "online") for i in range(5)])
+    db.execute_many("INSERT INTO RepData (device_id, value) VALUES (?, ?)",
+                    [("DEV001", 21.5), ("DEV002", 22.5)])
+
+    samples = db.get_sample_data_bulk(
+        {"DevMap": ["device_id", "device_name", "status"], "RepData": ["value"]}, 3)
+
+    assert len(samples["DevMap"]) == 3
+    assert all(len(row) == 3 for row in samples["DevMap"])
+    assert samples["DevMap"][0] == ("DEV000", "Device 0", "online")
+    assert sorted(samples["RepData"]) == [(21.5,), (22.5,)]
+
+def test_sample_data_bulk_empty_tables(db):
+    assert db.get_sample_data_bulk({}, 3) == {}
+    assert db.get_sample_data_bulk({"RepData": ["value"]}, 3) == {"RepData": []}
+
+def test_sample_data_bulk_missing_table_raises(db):
+    with pytest.raises(Exception):
+        db.get_sample_data_bulk({"DevMap": ["status"], "NoSuchTable": ["x"]}, 3)
+
+def test_oracle_sample_data_casts_by_type(monkeypatch):
+    oracle = OracleConnection({"schema": "IOT"})
+    executed = []
+    monkeypatch.setattr(oracle, "execute_query_tuples", lambda sql: executed.append(sql) or [])
+
+    oracle.get_sample_data_bulk(
+        {"DEVMAP": ["DEVICE_ID", "PHOTO", "INSTALLED"], "REPDATA": ["VALUE"]}, 2,
+        {"DEVMAP": ["VARCHAR2", "BLOB", "TIMESTAMP(6)"], "REPDATA": ["NUMBER"]})
+
+    assert executed == [
+        "SELECT 'DEVMAP', TO_CHAR(DEVICE_ID), NULL, TO_CHAR(INSTALLED) FROM DEVMAP WHERE ROWNUM <= 2"
+        " UNION ALL "
+        "SELECT 'REPDATA', TO_CHAR(VALUE), NULL, NULL FROM REPDATA WHERE ROWNUM <= 2"
+    ]
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for DomainMapper term scanning, with and without pyahocorasick
+"""
+
+import pytest
+
+from src import domain_mapping
+from src.domain_mapping import DomainMapper
+
+QUERY = "Which signals crossed the value limits last week on the device_configuration?"
+
+@pytest.fixture(params=["ahocorasick", "regex"])
+def mapper(request, monkeypatch):
+    """DomainMapper scanning with pyahocorasick, or with the regex fallback"""
+    if request.param == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(domain_mapping, "ahocorasick", None)
+    return DomainMapper()
+
+def test_scan_finds_tables_and_business_terms(mapper):
+    matches = mapper.scan(QUERY)
+
+    assert [(term, value) for _, _, term, value in matches] == [
+        ("signals", "RepData"),
+        ("crossed", mapper.business_terms["crossed"]),
+        ("limits", "ThreshSet"),
+        ("last week", mapper.business_terms["last week"]),
+        ("device_configuration", mapper.table_mappings["device_configuration"]),
+    ]
+    for start, end, term, _ in matches:
+        assert QUERY.lower()[start:end] == term
+
+def test_scan_prefers_longest_match(mapper):
+    # "signal" and "device"/"device_config" are also terms, but must not match inside these
+    terms = [term for _, _, term, _ in mapper.scan("signals from device_configuration")]
+    assert terms == ["signals", "device_configuration"]
+
+def test_scan_is_case_insensitive(mapper):
+    assert mapper.scan("SIGNALS") == mapper.scan("signals")
+
+def test_scan_without_terms(mapper):
+    assert mapper.scan("nothing relevant here") == []
+    assert mapper.scan("") == []
+
+def test_scan_business_terms(mapper):
+    assert mapper.scan_business_terms(QUERY) == [
+        (14, 21, "crossed"),
+        (32, 38, "limits"),
+        (39, 48, "last week"),
+    ]
+
+def test_scan_backends_agree(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    text = "Show alerts and alarms for devices in each zone yesterday and today"
+    expected = DomainMapper().scan(text)
+
+    monkeypatch.setattr(domain_mapping, "ahocorasick", None)
+    assert DomainMapper().scan(text) == expected
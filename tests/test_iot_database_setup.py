@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for sample data generation into a temporary SQLite database
+"""
+
+import pytest
+
+from src.iot_database_setup import IoTDatabaseSetup
+
+@pytest.fixture
+def setup(tmp_path):
+    """IoTDatabaseSetup with tables created and sample data loaded once"""
+    db = IoTDatabaseSetup(str(tmp_path / "iot.db"))
+    db.create_tables()
+    db.generate_sample_data()
+    yield db
+    db.conn.close()
+
+def _counts(setup):
+    return {table: setup.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("LocRef", "DevMap", "ThreshSet", "RepData")}
+
+def test_writer_failure_rolls_back(setup, monkeypatch):
+    before = _counts(setup)
+    generate_rows = setup._generate_rows
+
+    def bad_batch_first(seed, batches):
+        batches.put(("INSERT INTO NoSuchTable VALUES (?)", [(1,)]))
+        return generate_rows(seed, batches)
+
+    monkeypatch.setattr(setup, "_generate_rows", bad_batch_first)
+    with pytest.raises(Exception, match="NoSuchTable"):
+        setup.generate_sample_data()
+
+    assert not setup.conn.in_transaction
+    assert _counts(setup) == before
+
+def test_generation_failure_rolls_back(setup, monkeypatch):
+    before = _counts(setup)
+
+    def fail_midway(seed, batches):
+        # More batches than the queue holds, so the writer is busy when generation fails
+        for _ in range(10):
+            batches.put(("DELETE FROM RepData WHERE 1 = ?", [(1,)]))
+        raise ValueError("generation failed")
+
+    monkeypatch.setattr(setup, "_generate_rows", fail_midway)
+    with pytest.raises(ValueError, match="generation failed"):
+        setup.generate_sample_data()
+
+    assert not setup.conn.in_transaction
+    assert _counts(setup) == before
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for EnhancedQueryInterface's SQL cache, batched generation and sample
+fetching against a temporary SQLite database (no LLM calls are made)
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src import claude_query_interface
+from src.claude_query_interface import EnhancedQueryInterface
+from src.database import DatabaseManager
+
+class FakeLLMManager:
+    """Stands in for LLMProviderManager, counting provider calls"""
+
+    current_provider = "claude"
+    providers = {"claude": None}
+
+    def __init__(self, sql="SELECT device_id, status FROM DevMap WHERE status = 'offline'"):
+        self.sql = sql
+        self.calls = 0
+
+    def generate_sql(self, query, context, examples=None):
+        self.calls += 1
+        return self.sql, {"provider": "claude", "model": "fake", "confidence": 0.9}
+
+class FakeClient:
+    """Stands in for the Anthropic client, answering every request with `text`"""
+
+    def __init__(self, text):
+        self.messages = SimpleNamespace(
+            create=lambda **kwargs: SimpleNamespace(content=[SimpleNamespace(text=text)]))
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """DatabaseManager on a fresh SQLite file in tmp_path"""
+    monkeypatch.chdir(tmp_path)  # The development config and knowledge store use relative paths
+    manager = DatabaseManager()
+    assert manager.connect()
+    manager.execute_non_query(
+        "CREATE TABLE DevMap (device_id TEXT PRIMARY KEY, device_name TEXT, status TEXT)")
+    manager.execute_many("INSERT INTO DevMap VALUES (?, ?, ?)",
+                         [("DEV001", "Press 1", "online"), ("DEV002", "Press 2", "offline")])
+    yield manager
+    manager.close()
+
+@pytest.fixture
+def interface(db, tmp_path, monkeypatch):
+    """EnhancedQueryInterface with no LLM providers configured"""
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(claude_query_interface, "PROMPT_CACHE_DIR", tmp_path / ".cache")
+    iface = EnhancedQueryInterface(database_manager=db)
+    yield iface
+    iface.close()
+
+@pytest.fixture
+def llm(interface):
+    """Install a FakeLLMManager on the interface"""
+    fake = FakeLLMManager()
+    interface.llm_manager = fake
+    interface._has_any_llm = True
+    return fake
+
+def test_sql_cache_hit(interface, llm):
+    first = interface.execute_natural_language_query("Which devices are offline?")
+    second = interface.execute_natural_language_query("  which devices are OFFLINE ")
+
+    assert first["success"] and second["success"]
+    assert first["sql"] == second["sql"] == llm.sql
+    assert first["results"] == [{"device_id": "DEV002", "status": "offline"}]
+    assert llm.calls == 1
+
+def test_sql_cache_invalidated_by_schema_change(interface, db, llm):
+    interface.execute_natural_language_query("Which devices are offline?")
+    key = interface._sql_cache_key("claude", "Which devices are offline?")
+
+    db.execute_non_query("ALTER TABLE DevMap ADD COLUMN location TEXT")
+    interface.invalidate_schema_cache()
+
+    assert interface._sql_cache_key("claude", "Which devices are offline?")[2] != key[2]
+    interface.execute_natural_language_query("Which devices are offline?")
+    assert llm.calls == 2
+
+def test_sql_cache_keeps_fingerprint_until_invalidated(interface, db, llm):
+    interface.execute_natural_language_query("Which devices are offline?")
+    db.execute_many("INSERT INTO DevMap VALUES (?, ?, ?)", [("DEV003", "Press 3", "offline")])
+
+    result = interface.execute_natural_language_query("Which devices are offline?")
+    assert llm.calls == 1
+    assert result["count"] == 2
+
+@pytest.mark.parametrize("text, expected", [
+    # Prose and a markdown fence around the JSON array
+    ('Here you go:\n```json\n[{"idx": 1, "sql": " SELECT * FROM DevMap "},'
+     ' {"idx": 2, "sql": "SELECT COUNT(*) FROM DevMap"}]\n```',
+     ["SELECT * FROM DevMap", "SELECT COUNT(*) FROM DevMap"]),
+    # Out of order, with one query missing
+    ('[{"idx": 2, "sql": "SELECT status FROM DevMap"}]', [None, "SELECT status FROM DevMap"]),
+    # Entries without usable SQL
+    ('[{"idx": 1, "sql": null}, {"idx": 2, "sql": "I cannot answer that"}, "junk"]', [None, None]),
+    # Truncated JSON
+    ('[{"idx": 1, "sql": "SELECT * FROM DevMap"}, {"idx": 2, "sql": "SELECT', [None, None]),
+    # Malformed JSON
+    ("[{idx: 1, sql: 'SELECT * FROM DevMap'}]", [None, None]),
+    # No JSON array at all
+    ("Sorry, I can't help with that.", [None, None]),
+])
+def test_batch_generation_parsing(interface, text, expected):
+    interface.use_claude = True
+    interface.client = FakeClient(text)
+    assert interface.generate_sql_batch_with_claude(["all devices", "device count"]) == expected
+
+def test_batch_generation_without_claude(interface):
+    assert interface.generate_sql_batch_with_claude(["all devices", "device count"]) == [None, None]
+
+def test_sample_data_for_tables(interface):
+    samples = interface.get_sample_data_for_tables({"DevMap": ["device_id", "status"]}, limit=1)
+    assert samples == {"DevMap": [("DEV001", "online")]}
+
+def test_sample_data_falls_back_per_table(interface):
+    samples = interface.get_sample_data_for_tables(
+        {"DevMap": ["device_id"], "NoSuchTable": ["x"]}, limit=5)
+    assert sorted(tuple(row) for row in samples["DevMap"]) == [("DEV001",), ("DEV002",)]
+    assert samples["NoSuchTable"] == []